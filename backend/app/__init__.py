@@ -0,0 +1 @@
+from app import _bootstrap  # noqa: F401  (sys.path setup, runs once)
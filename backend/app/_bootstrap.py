@@ -0,0 +1,29 @@
+"""
+One-time sys.path setup for the sibling `agents` and `semantic_cache` packages.
+Imported from app/__init__.py so module reloads don't redo the path fixup.
+"""
+
+import os
+import sys
+
+
+def _bootstrap() -> None:
+    if getattr(sys, "_uofthacks_boot", False):
+        return
+
+    app_dir = os.path.dirname(os.path.abspath(__file__))
+
+    # Semantic cache module directory (takes precedence)
+    cache_dir = os.path.abspath(os.path.join(app_dir, "../../cache"))
+    if cache_dir not in sys.path:
+        sys.path.insert(0, cache_dir)
+
+    # Project root, for `agents.*` imports
+    root_dir = os.path.abspath(os.path.join(app_dir, "../.."))
+    if root_dir not in sys.path:
+        sys.path.append(root_dir)
+
+    sys._uofthacks_boot = True
+
+
+_bootstrap()
@@ -1,26 +1,31 @@
-import json
+import asyncio
+import hashlib
 import logging
-import math
+import re
+import uuid
+from datetime import datetime, timezone
 from typing import List, Dict
-from fastapi import APIRouter, HTTPException, BackgroundTasks
-from app.models.events import EventBatch, EventResponse, MotorTelemetryPayload
+
+import numpy as np
+from fastapi import APIRouter, BackgroundTasks, HTTPException
+from pydantic import TypeAdapter
+from app.models.events import (
+    EventBatch,
+    EventResponse,
+    MotorTelemetryPayload,
+    TelemetryEvent,
+)
+from app.models.motor import MotorFrames, pack_motor_samples
+from app.pipeline.motor_kernels import motor_diffs
+from app.pipeline.worker import TelemetryWorkerPool
 from app.db.mongo_client import mongo_client
 from app.db.redis_client import redis_client
-from app.pipeline.redis_keys import RedisKeys
+from app.pipeline.redis_keys import RedisKeys, SessionField, TTL
 from app.sse.publisher import sse_publisher
-from app.pipeline import reducer_pipeline
-from app.models.reducer import ReducerOutput, ReducerContext, ReducerPayload
 from app.config import settings
+from app.encoding import dumps, loads
 
-# Import semantic cache
-import sys
-import os
-
-current_dir = os.path.dirname(os.path.abspath(__file__))
-cache_dir = os.path.abspath(os.path.join(current_dir, "../../../cache"))
-if cache_dir not in sys.path:
-    sys.path.insert(0, cache_dir)
-
+# Import semantic cache (sys.path is set up once in app._bootstrap)
 try:
     from semantic_cache import semantic_cache, generate_telemetry_summary
 
@@ -34,15 +39,6 @@ except ImportError:
     generate_telemetry_summary = None
 
 # Import Agent Graph
-import sys
-import os
-
-# Ensure root directory is in path for agents import
-current_dir = os.path.dirname(os.path.abspath(__file__))
-root_dir = os.path.abspath(os.path.join(current_dir, "../../../"))
-if root_dir not in sys.path:
-    sys.path.append(root_dir)
-
 try:
     from agents.graph import run_layout_generation
 except ImportError:
@@ -58,6 +54,17 @@ logger = logging.getLogger(__name__)
 # Flag to track if semantic cache has been initialized
 _semantic_cache_initialized = False
 
+# Reused list serializer for batch events (built once at import)
+_EVENT_LIST = TypeAdapter(List[TelemetryEvent])
+
+# Case-insensitive match avoids lowercasing every target_id
+_LOUD_RE = re.compile(r"loud", re.IGNORECASE)
+
+# Below these sizes (and with no loud events) a batch carries too little
+# signal to be worth an agent run
+AGENT_MIN_EVENTS = 2
+AGENT_MIN_MOTOR_SAMPLES = 10
+
 
 async def ensure_semantic_cache_initialized():
     """Initialize semantic cache on first use."""
@@ -80,58 +87,92 @@ async def ensure_semantic_cache_initialized():
             logger.warning("Semantic cache disabled: GOOGLE_API_KEY not set")
 
 
-def transform_motor_samples(motor: MotorTelemetryPayload) -> List[Dict]:
+def agent_cache_fingerprint(
+    current_preferences: Dict, loud_count: int, motor_count: int
+) -> str:
     """
-    Transform frontend motor samples [[x, y], ...] into format expected by motor_analyzer.
+    Coarse fingerprint of the agent inputs.
+
+    Counts are bucketed so similar batches on the same preferences share
+    a cached agent result.
+    """
+    key = dumps(
+        [sorted(current_preferences.items()), loud_count // 5, motor_count // 50]
+    )
+    return hashlib.blake2b(key, digest_size=8).hexdigest()
+
+
+def classify_motor_state(motor_data: MotorFrames) -> str:
+    """Estimate the user's motor state from recent velocity and jerk."""
+    n = len(motor_data)
+    if not n:
+        return "idle"
+
+    # Mean of (|vx| + |vy|) / 2 over the last 10 samples
+    avg_velocity = float(np.abs(motor_data.vel[-10:]).sum()) / 2 / min(n, 10)
+
+    # Mean jerk over samples 2..11
+    avg_jerk = 0
+    if n >= 3:
+        jerk = np.abs(np.diff(motor_data.acc[1:12], axis=0))
+        avg_jerk = float(jerk.sum()) / 2 / min(n - 2, 10)
+
+    if avg_velocity < 50:
+        return "idle"
+    if avg_jerk > 1000 and avg_velocity < 300:
+        return "jittery"
+    if avg_velocity > 500 and avg_jerk < 500:
+        return "determined"
+    return "browsing"
+
+
+def agent_signature(
+    event_types: List[str],
+    target_ids: List[str],
+    motor_state: str,
+    current_preferences: Dict,
+) -> str:
+    """
+    Fingerprint of the batch content the agent would run on.
+
+    Covers the event sequence, the motor-state classification and the
+    current preferences, so a batch with the same counts but different
+    content still re-runs the agent.
+    """
+    key = dumps(
+        [event_types, target_ids, motor_state, sorted(current_preferences.items())]
+    )
+    return hashlib.blake2b(key, digest_size=8).hexdigest()
+
 
-    Calculates velocity and acceleration from position samples.
+def transform_motor_samples(motor: MotorTelemetryPayload) -> MotorFrames:
+    """
+    Transform frontend motor samples [[x, y], ...] into MotorFrames.
+
+    Calculates velocity and acceleration from position samples with
+    vectorized finite differences. Use MotorFrames.to_dicts() for consumers
+    that expect the nested dict shape.
     """
     if not motor or not motor.samples or len(motor.samples) < 2:
-        return []
+        return MotorFrames.empty()
 
-    samples = motor.samples
+    pos = np.ascontiguousarray(
+        np.asarray(motor.samples, dtype=np.float64)[:, :2]
+    )
     dt_sec = motor.dt / 1000.0  # Convert ms to seconds
-    result = []
-
-    prev_vel_x, prev_vel_y = 0.0, 0.0
-
-    for i, sample in enumerate(samples):
-        x, y = sample[0], sample[1]
-        timestamp = motor.t0 + (i * motor.dt)
-
-        # Calculate velocity (derivative of position)
-        if i > 0:
-            prev_x, prev_y = samples[i - 1][0], samples[i - 1][1]
-            vel_x = (x - prev_x) / dt_sec if dt_sec > 0 else 0
-            vel_y = (y - prev_y) / dt_sec if dt_sec > 0 else 0
-        else:
-            vel_x, vel_y = 0.0, 0.0
-
-        # Calculate acceleration (derivative of velocity)
-        if i > 0:
-            acc_x = (vel_x - prev_vel_x) / dt_sec if dt_sec > 0 else 0
-            acc_y = (vel_y - prev_vel_y) / dt_sec if dt_sec > 0 else 0
-        else:
-            acc_x, acc_y = 0.0, 0.0
-
-        result.append(
-            {
-                "timestamp": timestamp,
-                "position": {"x": x, "y": y},
-                "velocity": {"x": vel_x, "y": vel_y},
-                "acceleration": {"x": acc_x, "y": acc_y},
-            }
-        )
 
-        prev_vel_x, prev_vel_y = vel_x, vel_y
+    # First sample has zero velocity/acceleration by definition
+    vel, acc = motor_diffs(pos, dt_sec)
+
+    ts = motor.t0 + np.arange(len(pos)) * motor.dt
 
-    return result
+    return MotorFrames(ts=ts, pos=pos, vel=vel, acc=acc)
 
 
 async def process_telemetry_batch(batch: EventBatch):
     """
     Process telemetry batch in background:
-    1. Save raw events to MongoDB 'telemetry' collection
+    1. Save events to MongoDB 'telemetry_buckets' (one columnar doc per batch)
     2. Save motor data to 'motor_telemetry' collection
     3. Run reducer pipeline to generate layout
     4. Publish layout update via SSE
@@ -140,25 +181,43 @@ async def process_telemetry_batch(batch: EventBatch):
         # ========================================
         # Step 1: Save events to MongoDB
         # ========================================
-        docs = []
-        for event in batch.events:
-            doc = event.model_dump()
-            doc["session_id"] = batch.session_id
-            doc["device_type"] = batch.device_type
-            doc["batch_timestamp"] = batch.timestamp
-            docs.append(doc)
-
-        if docs:
-            await mongo_client.telemetry.insert_many(docs)
-
-        # Handle motor data if present
+        # Events are stored column-wise: batch fields once, then one array
+        # per event field. created_at is a BSON date for the TTL index.
+        columns = {field: [] for field in TelemetryEvent.model_fields}
+        # One serializer call for the whole list instead of one per event
+        interaction_events = _EVENT_LIST.dump_python(batch.events)
+        loud_events = []
+        for d in interaction_events:
+            for field, column in columns.items():
+                column.append(d[field])
+
+            metadata = d["metadata"] or {}
+            if metadata.get("is_loud", False) or _LOUD_RE.search(d["target_id"] or ""):
+                loud_events.append(d)
+
+        created_at = datetime.now(timezone.utc)
+
+        # Handle motor data if present. Motor docs are buffered and flushed
+        # in bulk by a background writer instead of one insert per batch.
         if batch.motor:
-            motor_doc = batch.motor.model_dump()
+            motor_doc = batch.motor.model_dump(exclude={"samples"})
+            motor_doc.update(pack_motor_samples(batch.motor.samples))
             motor_doc["session_id"] = batch.session_id
             motor_doc["batch_timestamp"] = batch.timestamp
-            await mongo_client.db.motor_telemetry.insert_one(motor_doc)
-
-        logger.info(f"Stored {len(docs)} events for session {batch.session_id}")
+            motor_doc["created_at"] = created_at
+            mongo_client.motor_buffer.push(motor_doc)
+
+        writes = []
+        if batch.events:
+            bucket_doc = {
+                "session_id": batch.session_id,
+                "device_type": batch.device_type,
+                "batch_timestamp": batch.timestamp,
+                "created_at": created_at,
+                "count": len(batch.events),
+                **columns,
+            }
+            writes.append(mongo_client.telemetry_buckets.insert_one(bucket_doc))
 
         # ========================================
         # Step 2: Run Reducer Pipeline (with Concurrency Lock)
@@ -166,9 +225,37 @@ async def process_telemetry_batch(batch: EventBatch):
 
         # Check if agent is already running for this session
         LOCK_KEY = f"agent_lock:{batch.session_id}"
-        # Try to acquire lock for 30 seconds (max expected duration)
-        # We use a simple SETNX equivalent: set(key, value, ex=ttl, nx=True)
-        is_locked = await redis_client.set(LOCK_KEY, "running", ex=30, nx=True)
+        # Try to acquire lock for 30 seconds (max expected duration) and
+        # fetch the cached preferences in the same pipelined round-trip.
+        # The random token lets us release only a lock we still own.
+        # This runs concurrently with the Mongo write so its RTT is hidden.
+        lock_token = uuid.uuid4().hex
+        *write_results, lock_result = await asyncio.gather(
+            *writes,
+            redis_client.acquire_lock_and_get_state(
+                LOCK_KEY,
+                RedisKeys.session(batch.session_id),
+                lock_token,
+                ttl=30,
+                field=SessionField.STATE,
+            ),
+            return_exceptions=True,
+        )
+        if isinstance(lock_result, BaseException):
+            raise lock_result
+        is_locked, cached_state = lock_result
+
+        write_error = next(
+            (r for r in write_results if isinstance(r, BaseException)), None
+        )
+        if write_error is not None:
+            if is_locked:
+                await redis_client.release_lock(LOCK_KEY, lock_token)
+            raise write_error
+
+        logger.debug(
+            "Stored %d events for session %s", len(batch.events), batch.session_id
+        )
 
         if not is_locked:
             logger.info(
@@ -177,31 +264,42 @@ async def process_telemetry_batch(batch: EventBatch):
             return
 
         try:
-            # 1. Fetch current preferences from Redis
+            # 1. Parse current preferences fetched alongside the lock
             current_preferences = {}
             try:
-                cached_state = await redis_client.get(RedisKeys.state(batch.session_id))
                 if cached_state:
-                    current_preferences = json.loads(cached_state)
+                    current_preferences = loads(cached_state)
             except Exception as e:
-                logger.warning(f"Failed to fetch cached state: {e}")
+                logger.warning(f"Failed to parse cached state: {e}")
 
             # 2. Prepare telemetry data for processing
-            motor_data = []
+            motor_data = MotorFrames.empty()
             if batch.motor:
                 motor_data = transform_motor_samples(batch.motor)
-                logger.info(f"Transformed {len(motor_data)} motor samples for analysis")
-
-            # Extract interaction events (all events in batch)
-            interaction_events = [e.model_dump() for e in batch.events]
+                logger.debug("Transformed %d motor samples for analysis", len(motor_data))
 
-            # Filter 'loud' module events as a subset
-            loud_events = [
-                e
-                for e in interaction_events
-                if (e.get("metadata") or {}).get("is_loud", False)
-                or "loud" in (e.get("target_id") or "").lower()
-            ]
+            # Skip inference for no-op batches, or when the batch content
+            # matches the last one the agent already ran on
+            if (
+                len(batch.events) < AGENT_MIN_EVENTS
+                and len(motor_data) < AGENT_MIN_MOTOR_SAMPLES
+                and not loud_events
+            ):
+                logger.info(
+                    f"Skipping agent workflow for session {batch.session_id} - batch below noise floor"
+                )
+                return
+
+            motor_state = classify_motor_state(motor_data)
+            agent_sig = agent_signature(
+                columns["type"], columns["target_id"], motor_state, current_preferences
+            )
+            sig_key = RedisKeys.agent_signature(batch.session_id)
+            if await redis_client.get(sig_key) == agent_sig:
+                logger.info(
+                    f"Skipping agent workflow for session {batch.session_id} - unchanged batch signature"
+                )
+                return
 
             # ========================================
             # Step 2.5: Check Semantic Cache
@@ -220,42 +318,6 @@ async def process_telemetry_batch(batch: EventBatch):
             ):
                 try:
                     # Generate telemetry summary for cache lookup
-                    # Estimate motor state from velocity patterns
-                    motor_state = "idle"
-                    if motor_data:
-                        avg_velocity = sum(
-                            (
-                                abs(s.get("velocity", {}).get("x", 0))
-                                + abs(s.get("velocity", {}).get("y", 0))
-                            )
-                            / 2
-                            for s in motor_data[-10:]
-                        ) / min(len(motor_data), 10)
-
-                        avg_jerk = 0
-                        if len(motor_data) >= 3:
-                            for i in range(2, min(len(motor_data), 12)):
-                                acc_prev = motor_data[i - 1].get("acceleration", {})
-                                acc_curr = motor_data[i].get("acceleration", {})
-                                jerk_x = abs(
-                                    acc_curr.get("x", 0) - acc_prev.get("x", 0)
-                                )
-                                jerk_y = abs(
-                                    acc_curr.get("y", 0) - acc_prev.get("y", 0)
-                                )
-                                avg_jerk += (jerk_x + jerk_y) / 2
-                            avg_jerk /= min(len(motor_data) - 2, 10)
-
-                        # Classify motor state
-                        if avg_velocity < 50:
-                            motor_state = "idle"
-                        elif avg_jerk > 1000 and avg_velocity < 300:
-                            motor_state = "jittery"
-                        elif avg_velocity > 500 and avg_jerk < 500:
-                            motor_state = "determined"
-                        else:
-                            motor_state = "browsing"
-
                     telemetry_summary = generate_telemetry_summary(
                         session_id=batch.session_id,
                         motor_state=motor_state,
@@ -283,10 +345,30 @@ async def process_telemetry_batch(batch: EventBatch):
                 except Exception as e:
                     logger.warning(f"Semantic cache lookup failed: {e}")
 
+            # Exact-fingerprint agent output cache (shared across sessions)
+            agent_cache_key = None
+            if settings.SEMANTIC_CACHE_ENABLED:
+                agent_cache_key = RedisKeys.agent_cache(
+                    agent_cache_fingerprint(
+                        current_preferences, len(loud_events), len(motor_data)
+                    )
+                )
+                if not cache_hit:
+                    try:
+                        cached_result = await redis_client.get_json(agent_cache_key)
+                        if cached_result:
+                            cache_hit = True
+                            suggested_id = cached_result["suggested_id"]
+                            recommended_genre = cached_result["recommended_genre"]
+                            profile_summary = cached_result["profile_summary"]
+                            logger.info(
+                                f"Agent cache hit - Skipping agent call. ID: {suggested_id}"
+                            )
+                    except Exception as e:
+                        logger.warning(f"Agent cache lookup failed: {e}")
+
             # 3. Run Agent Graph (Inference) - ONLY if cache miss
             if not cache_hit:
-                reducer_output = None
-
                 if run_layout_generation:
                     try:
                         logger.info(
@@ -295,7 +377,7 @@ async def process_telemetry_batch(batch: EventBatch):
 
                         user_profile_dict = await run_layout_generation(
                             session_id=batch.session_id,
-                            telemetry_batch=motor_data,
+                            telemetry_batch=motor_data.to_dicts(),
                             interactions=interaction_events,
                             loud_module_events=loud_events,
                             current_preferences=current_preferences,
@@ -344,14 +426,29 @@ async def process_telemetry_batch(batch: EventBatch):
                                         f"Failed to store result in semantic cache: {e}"
                                     )
 
+                            if agent_cache_key:
+                                try:
+                                    await redis_client.set_json(
+                                        agent_cache_key,
+                                        {
+                                            "suggested_id": suggested_id,
+                                            "recommended_genre": recommended_genre,
+                                            "profile_summary": profile_summary,
+                                        },
+                                        ttl=TTL.AGENT_CACHE,
+                                    )
+                                except Exception as e:
+                                    logger.warning(
+                                        f"Failed to store result in agent cache: {e}"
+                                    )
+
                             # ========================================
                             # Step 2.6: Persist Analysis for Long-Term Session Memory
                             # ========================================
                             try:
-                                import datetime
                                 snapshot = {
                                     "session_id": batch.session_id,
-                                    "timestamp": datetime.datetime.now(datetime.timezone.utc),
+                                    "timestamp": datetime.now(timezone.utc),
                                     "vibe_summary": profile_summary,
                                     "is_explore": is_explore,  # A/B tracking tag
                                     "constraints_summary": {
@@ -361,7 +458,7 @@ async def process_telemetry_batch(batch: EventBatch):
                                     "behavioral_summary": user_profile_dict.get("behavioral_description", ""),
                                     "suggested_id": suggested_id
                                 }
-                                await mongo_client.db.reducer_snapshots.insert_one(snapshot)
+                                await mongo_client.reducer_snapshots.insert_one(snapshot)
                                 logger.info(f"Persisted analysis snapshot for session {batch.session_id}")
                             except Exception as e:
                                 logger.error(f"Failed to persist analysis snapshot: {e}")
@@ -384,7 +481,7 @@ async def process_telemetry_batch(batch: EventBatch):
             # ========================================
             # Step 3: Publish Layout Update via SSE
             # ========================================
-            await sse_publisher.publish_layout_update(
+            sse_publisher.enqueue(
                 session_id=batch.session_id,
                 layout_update={
                     "suggested_id": suggested_id,  # The specific Integer ID (0-35)
@@ -394,38 +491,59 @@ async def process_telemetry_batch(batch: EventBatch):
                 },
             )
 
-            logger.info(
-                f"Published layout update via SSE for session {batch.session_id}"
-            )
+            logger.debug("Queued layout update via SSE for session %s", batch.session_id)
+
+            await redis_client.set(sig_key, agent_sig, ex=TTL.AGENT_SIGNATURE)
 
         finally:
-            # Release lock
-            await redis_client.delete(LOCK_KEY)
+            # Release lock (no-op if it expired and another task took it)
+            await redis_client.release_lock(LOCK_KEY, lock_token)
+
+        logger.debug(
+            "Pipeline summary session=%s events=%d suggested_id=%s genre=%s profile=%s",
+            batch.session_id,
+            len(batch.events),
+            suggested_id,
+            recommended_genre,
+            profile_summary,
+        )
 
-        # DEBUG: Log summary
-        print(f"\n=== TELEMETRY → VECTOR PIPELINE ===")
-        print(f"Session: {batch.session_id}")
-        print(f"Events: {len(docs)}")
-        print(f"Suggested Module ID: {suggested_id}")  # The 0-35 integer ID
-        print(f"Recommended Genre: {recommended_genre}")
-        print(f"Profile: {profile_summary}")
-        print(f"===================================")
+    except Exception:
+        logger.exception("Error processing telemetry batch")
 
-    except Exception as e:
-        logger.error(f"Error processing telemetry batch: {e}")
-        import traceback
 
-        traceback.print_exc()
+# Bounded consumers for process_telemetry_batch, started in the app lifespan.
+# Concurrency stays within the MongoDB connection pool.
+telemetry_pool = TelemetryWorkerPool(
+    process_telemetry_batch,
+    workers=min(settings.TELEMETRY_WORKERS, settings.MONGODB_MAX_POOL_SIZE),
+    max_queue=settings.TELEMETRY_QUEUE_SIZE,
+)
 
 
 @router.post("/events", response_model=EventResponse)
 async def receive_events(batch: EventBatch, background_tasks: BackgroundTasks):
     """
     Receive batched telemetry events from frontend.
-    Processing is offloaded to background task to keep API fast.
-    Returns immediately, pipeline runs async.
+    Processing is queued onto the telemetry worker pool to keep API fast.
+    Returns as soon as the batch is queued and the pipeline runs async;
+    if the queue is full the batch is rejected with 503 and Retry-After.
     """
-    # Offload storage, pipeline, and SSE publishing to background
-    background_tasks.add_task(process_telemetry_batch, batch)
+    if telemetry_pool.is_running:
+        # Offload storage, pipeline, and SSE publishing to the worker pool.
+        # When the queue is full, reject with 503 so clients back off.
+        if not telemetry_pool.submit_nowait(batch):
+            logger.warning(
+                f"Telemetry queue full, rejected batch for session "
+                f"{batch.session_id} with 503 ({telemetry_pool.dropped} total)"
+            )
+            raise HTTPException(
+                status_code=503,
+                detail="Telemetry queue full",
+                headers={"Retry-After": "1"},
+            )
+    else:
+        # Pool not started (e.g. app run without lifespan) - fall back
+        background_tasks.add_task(process_telemetry_batch, batch)
 
     return EventResponse(received=len(batch.events), session_id=batch.session_id)
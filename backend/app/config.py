@@ -26,6 +26,19 @@ class Settings(BaseSettings):
 
     # Redis (session cache, motor state)
     REDIS_URL: str = "redis://localhost:6379"
+    REDIS_MAX_CONNECTIONS: int = Field(
+        default=64, description="Maximum connections in the Redis pool"
+    )
+    REDIS_POOL_TIMEOUT: float = Field(
+        default=5.0,
+        description="Seconds to wait for a free pooled connection before erroring",
+    )
+    REDIS_HEALTH_CHECK_INTERVAL: int = Field(
+        default=30, description="Seconds idle before a pooled connection is re-checked"
+    )
+    REDIS_PROTOCOL: int = Field(
+        default=3, description="RESP protocol version (3 needs Redis 6+)"
+    )
 
     # MongoDB (cold storage, preferences, telemetry)
     MONGODB_URL: str = "mongodb://localhost:27017"
@@ -74,6 +87,27 @@ class Settings(BaseSettings):
     # =========================================
     OPENROUTER_API_KEY: str = ""
 
+    # =========================================
+    # Telemetry Processing
+    # =========================================
+    TELEMETRY_WORKERS: int = Field(
+        default=8, description="Concurrent telemetry batch consumers"
+    )
+    TELEMETRY_QUEUE_SIZE: int = Field(
+        default=256,
+        description="Pending batches before POST /telemetry/events returns 503",
+    )
+
+    # Startup warmup (connection pools + local request paths)
+    STARTUP_WARMUP_ENABLED: bool = True
+    # Also push one synthetic batch through the agent graph. Off by default:
+    # it makes a paid LLM call and writes __warmup__ state to Redis/Mongo.
+    STARTUP_WARMUP_AGENT: bool = False
+    STARTUP_WARMUP_TIMEOUT_SECONDS: float = 10.0
+
+    # /health reuses its last probe result for this long (0 disables)
+    HEALTH_CACHE_TTL_SECONDS: float = 1.0
+
     # =========================================
     # Semantic Cache Configuration
     # =========================================
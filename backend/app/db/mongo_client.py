@@ -4,13 +4,133 @@ Production-ready with connection pooling, retries, and health checks
 """
 
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+from pymongo import WriteConcern
 from pymongo.errors import ConnectionFailure, ServerSelectionTimeoutError
 from app.config import settings
+from app.models.events import TelemetryEvent
 import logging
 import asyncio
 
 logger = logging.getLogger(__name__)
 
+# Queued by BufferedWriter.stop() behind the last document to end the flush task
+_STOP = object()
+
+
+class BufferedWriter:
+    """
+    Buffers documents for one collection in-process and flushes them in bulk.
+
+    A background task drains the queue every `flush_interval` seconds or
+    `max_batch` documents, whichever comes first, and writes them with a
+    single insert_many using `write_concern`. Writes are acknowledged
+    (w=1) by default so the server reports insert failures; one
+    acknowledgement per batch is cheap next to an insert per document.
+    """
+
+    def __init__(
+        self,
+        collection_name: str,
+        max_batch: int = 100,
+        flush_interval: float = 0.1,
+        max_queue: int = 10_000,
+        write_concern: WriteConcern = WriteConcern(w=1),
+    ):
+        self.collection_name = collection_name
+        self.write_concern = write_concern
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self._collection = None
+        self._task: asyncio.Task | None = None
+        # Observability counters (documents, not flushes). failed_docs
+        # includes server-side insert errors only under an acknowledged
+        # write concern; with w=0 the server never reports them.
+        self.dropped_docs = 0
+        self.failed_docs = 0
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None
+
+    def start(self, db: AsyncIOMotorDatabase) -> None:
+        """Start the background flush task against the given database."""
+        if self._task is not None:
+            return
+        self._collection = db.get_collection(
+            self.collection_name, write_concern=self.write_concern
+        )
+        self._task = asyncio.create_task(self._run())
+        logger.info(f"Buffered writer started ({self.collection_name})")
+
+    async def stop(self) -> None:
+        """
+        Stop the flush task and write out anything still queued.
+
+        The task is not cancelled: a stop marker is queued behind the last
+        document, so the batch being collected and any insert_many in flight
+        complete before the task returns. New pushes are refused meanwhile.
+        """
+        if self._task is None:
+            return
+        task, self._task = self._task, None
+        await self._queue.put(_STOP)
+        await task
+
+    def push(self, doc: dict) -> bool:
+        """
+        Queue a document for the next flush (non-blocking).
+
+        Returns:
+            False if the writer is not running or the buffer is full
+        """
+        if self._task is None:
+            return False
+        try:
+            self._queue.put_nowait(doc)
+            return True
+        except asyncio.QueueFull:
+            self.dropped_docs += 1
+            logger.warning(f"{self.collection_name} buffer full, dropping document")
+            return False
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            doc = await self._queue.get()
+            if doc is _STOP:
+                return
+            batch = [doc]
+            stopping = False
+            deadline = loop.time() + self.flush_interval
+
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    doc = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if doc is _STOP:
+                    stopping = True
+                    break
+                batch.append(doc)
+
+            await self._flush(batch)
+            if stopping:
+                return
+
+    async def _flush(self, batch: list) -> None:
+        try:
+            await self._collection.insert_many(batch, ordered=False)
+        except Exception as e:
+            self.failed_docs += len(batch)
+            logger.error(
+                f"{self.collection_name} flush failed ({len(batch)} docs, "
+                f"{self.failed_docs} total): {e}"
+            )
+
 
 class MongoClient:
     """
@@ -21,10 +141,24 @@ class MongoClient:
     - Index management
     """
 
+    COLLECTIONS = (
+        "sessions",
+        "preferences",
+        "layouts",
+        "telemetry_buckets",
+        "motor_telemetry",
+        "reducer_snapshots",
+        "analytics",
+    )
+
     def __init__(self):
         self.client: AsyncIOMotorClient | None = None
         self.db: AsyncIOMotorDatabase | None = None
         self._connected: bool = False
+        # Collection handles cached at connect time (name -> collection)
+        self._collections: dict = {}
+        self.motor_buffer = BufferedWriter("motor_telemetry")
+        self.snapshot_buffer = BufferedWriter("reducer_snapshots", max_batch=200)
 
     async def connect(self, max_retries: int = 3, retry_delay: float = 1.0) -> None:
         """
@@ -52,6 +186,9 @@ class MongoClient:
                 await self.client.admin.command("ping")
 
                 self.db = self.client[settings.MONGODB_DATABASE]
+                self._collections = {
+                    name: self.db[name] for name in self.COLLECTIONS
+                }
                 self._connected = True
 
                 logger.info(f"Connected to MongoDB: {settings.MONGODB_DATABASE}")
@@ -75,6 +212,7 @@ class MongoClient:
         if self.client:
             self.client.close()
             self._connected = False
+            self._collections = {}
             logger.info("Disconnected from MongoDB")
 
     async def health_check(self) -> dict:
@@ -91,37 +229,98 @@ class MongoClient:
             import time
 
             start = time.monotonic()
-            await self.client.admin.command("ping")
+            # A single hello both checks liveness and reports the node role
+            hello = await self.client.admin.command("hello")
             latency_ms = (time.monotonic() - start) * 1000
 
             return {
                 "status": "connected",
                 "database": settings.MONGODB_DATABASE,
+                "writable_primary": hello.get("isWritablePrimary", False),
                 "latency_ms": round(latency_ms, 2),
             }
         except Exception as e:
             return {"status": "error", "error": str(e)}
 
+    async def session_events(self, session_id: str, limit: int = 500) -> list:
+        """
+        Read interaction events back out of telemetry_buckets, newest batch
+        first. Each column array is zipped into one document per event and
+        unwound, so callers see the same shape as a TelemetryEvent.
+        """
+        event = {
+            field: {"$arrayElemAt": [f"${field}", "$$i"]}
+            for field in TelemetryEvent.model_fields
+        }
+        pipeline = [
+            {"$match": {"session_id": session_id}},
+            {"$sort": {"batch_timestamp": -1}},
+            {
+                "$project": {
+                    "_id": 0,
+                    "session_id": 1,
+                    "device_type": 1,
+                    "batch_timestamp": 1,
+                    "event": {
+                        "$map": {
+                            "input": {"$range": [0, "$count"]},
+                            "as": "i",
+                            "in": event,
+                        }
+                    },
+                }
+            },
+            {"$unwind": "$event"},
+            {
+                "$replaceRoot": {
+                    "newRoot": {
+                        "$mergeObjects": [
+                            {
+                                "session_id": "$session_id",
+                                "device_type": "$device_type",
+                                "batch_timestamp": "$batch_timestamp",
+                            },
+                            "$event",
+                        ]
+                    }
+                }
+            },
+            {"$limit": limit},
+        ]
+        cursor = self.telemetry_buckets.aggregate(pipeline)
+        return await cursor.to_list(length=limit)
+
     async def _ensure_indexes(self) -> None:
         """
         Create indexes for optimal query performance.
         Indexes are created in the background and are idempotent.
         """
         try:
-            # Telemetry collection indexes
-            # Compound index for session-based time queries
-            await self.telemetry.create_index(
-                [("session_id", 1), ("timestamp", -1)],
+            # Telemetry buckets (one columnar document per event batch)
+            # (session_id, batch_timestamp) also serves session_id-only queries
+            await self.telemetry_buckets.create_index(
+                [("session_id", 1), ("batch_timestamp", -1)],
+                background=True,
+                name="session_batchts_idx",
+            )
+            await self.telemetry_buckets.create_index(
+                "created_at",
+                expireAfterSeconds=7 * 24 * 60 * 60,  # 7 days
                 background=True,
-                name="session_timestamp_idx",
+                name="telemetry_buckets_ttl_idx",
             )
 
-            # TTL index to auto-expire old telemetry after 30 days
-            await self.telemetry.create_index(
-                "timestamp",
-                expireAfterSeconds=30 * 24 * 60 * 60,  # 30 days
+            # Motor telemetry collection
+            await self.motor_telemetry.create_index(
+                [("session_id", 1), ("batch_timestamp", -1)],
+                background=True,
+                name="motor_session_batchts_idx",
+            )
+            await self.motor_telemetry.create_index(
+                "created_at",
+                expireAfterSeconds=7 * 24 * 60 * 60,  # 7 days
                 background=True,
-                name="telemetry_ttl_idx",
+                name="motor_telemetry_ttl_idx",
             )
 
             # Sessions collection
@@ -151,13 +350,13 @@ class MongoClient:
             )
 
             # Reducer snapshots collection (Intra-session memory)
-            await self.db.reducer_snapshots.create_index(
+            await self.reducer_snapshots.create_index(
                 "timestamp",
                 expireAfterSeconds=24 * 60 * 60,  # 24 hours TTL
                 background=True,
                 name="reducer_snapshots_ttl_idx",
             )
-            await self.db.reducer_snapshots.create_index(
+            await self.reducer_snapshots.create_index(
                 "session_id",
                 background=True,
                 name="reducer_snapshots_session_idx",
@@ -177,30 +376,45 @@ class MongoClient:
     # Collection Accessors
     # =========================================
 
+    def _collection(self, name: str):
+        """Return the cached handle, falling back to a fresh lookup"""
+        coll = self._collections.get(name)
+        return coll if coll is not None else self.db[name]
+
     @property
     def sessions(self):
         """Sessions collection - active user sessions"""
-        return self.db.sessions
+        return self._collection("sessions")
 
     @property
     def preferences(self):
         """User preferences collection - learned style preferences"""
-        return self.db.preferences
+        return self._collection("preferences")
 
     @property
     def layouts(self):
         """Generated layouts collection - cached layout schemas"""
-        return self.db.layouts
+        return self._collection("layouts")
+
+    @property
+    def telemetry_buckets(self):
+        """Interaction events stored column-wise, one document per batch"""
+        return self._collection("telemetry_buckets")
+
+    @property
+    def motor_telemetry(self):
+        """Raw motor samples collection - one document per batch"""
+        return self._collection("motor_telemetry")
 
     @property
-    def telemetry(self):
-        """Raw telemetry data collection - motor + interaction events"""
-        return self.db.telemetry
+    def reducer_snapshots(self):
+        """Agent analysis snapshots - long-term session memory"""
+        return self._collection("reducer_snapshots")
 
     @property
     def analytics(self):
         """Aggregated analytics collection"""
-        return self.db.analytics
+        return self._collection("analytics")
 
 
 # Singleton instance
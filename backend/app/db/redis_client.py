@@ -3,32 +3,65 @@ Redis client for real-time session data
 """
 
 import redis.asyncio as redis
+from redis.client import NEVER_DECODE
+from redis.utils import HIREDIS_AVAILABLE
+from typing import Any
 from app.config import settings
+from app.encoding import dumps_str, loads
 import logging
 import time
 
 logger = logging.getLogger(__name__)
 
+# Compare-and-delete: only the holder of the token may release the lock
+_RELEASE_LOCK_LUA = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+else
+    return 0
+end
+"""
+
 
 class RedisClient:
     """Async Redis client wrapper with health check"""
 
     def __init__(self):
         self.client = None
+        self.pool = None
         self._connected = False
+        self._release_lock_script = None
 
     async def connect(self):
         """Connect to Redis"""
         try:
-            self.client = await redis.from_url(
+            # One explicit, bounded pool shared by every command and pipeline.
+            # The blocking pool makes callers wait for a free connection when
+            # all are checked out instead of raising immediately.
+            self.pool = redis.BlockingConnectionPool.from_url(
                 settings.REDIS_URL,
                 encoding="utf-8",
                 decode_responses=True,
+                max_connections=settings.REDIS_MAX_CONNECTIONS,
+                timeout=settings.REDIS_POOL_TIMEOUT,
+                socket_keepalive=True,
+                health_check_interval=settings.REDIS_HEALTH_CHECK_INTERVAL,
+                # RESP3 replies are typed; hiredis (when installed) parses
+                # them in C instead of the pure-Python parser
+                protocol=settings.REDIS_PROTOCOL,
             )
+            self.client = redis.Redis(connection_pool=self.pool)
             # Verify connection
             await self.client.ping()
+            self._release_lock_script = self.client.register_script(
+                _RELEASE_LOCK_LUA
+            )
             self._connected = True
-            logger.info(f"Connected to Redis: {settings.REDIS_URL}")
+            logger.info(
+                f"Connected to Redis: {settings.REDIS_URL} "
+                f"(RESP{settings.REDIS_PROTOCOL}, "
+                f"parser={'hiredis' if HIREDIS_AVAILABLE else 'python'})"
+            )
         except Exception as e:
             logger.error(f"Failed to connect to Redis: {e}")
             raise
@@ -37,6 +70,8 @@ class RedisClient:
         """Disconnect from Redis"""
         if self.client:
             await self.client.close()
+            # Redis() does not own a pool passed in, so close it explicitly
+            await self.pool.disconnect()
             self._connected = False
             logger.info("Disconnected from Redis")
 
@@ -47,11 +82,16 @@ class RedisClient:
 
         try:
             start = time.monotonic()
-            await self.client.ping()
+            # PING and INFO share one round trip
+            async with self.client.pipeline(transaction=False) as pipe:
+                pipe.ping()
+                pipe.info("server")
+                _, info = await pipe.execute()
             latency_ms = (time.monotonic() - start) * 1000
 
             return {
                 "status": "connected",
+                "version": info.get("redis_version"),
                 "latency_ms": round(latency_ms, 2),
             }
         except Exception as e:
@@ -90,11 +130,126 @@ class RedisClient:
             await self.client.set(key, value)
             return True
 
+    async def mget(self, keys: list[str]) -> list[str | None]:
+        """Get several keys in one round trip (None for missing keys)"""
+        if not keys:
+            return []
+        return await self.client.mget(keys)
+
+    async def set_many(self, items: list[tuple[str, str, int | None]]) -> None:
+        """
+        Set several (key, value, ttl) entries in one round trip.
+
+        The writes are independent, so they are pipelined without a
+        MULTI/EXEC transaction. A ttl of None sets the key without expiry.
+        """
+        if not items:
+            return
+        async with self.client.pipeline(transaction=False) as pipe:
+            for key, value, ttl in items:
+                if ttl:
+                    pipe.setex(key, ttl, value)
+                else:
+                    pipe.set(key, value)
+            await pipe.execute()
+
+    async def hget(self, key: str, field: str) -> str | None:
+        """Get one hash field"""
+        return await self.client.hget(key, field)
+
+    async def hget_bytes(self, key: str, field: str) -> bytes | None:
+        """Get a binary hash field, bypassing response decoding"""
+        return await self.client.execute_command(
+            "HGET", key, field, **{NEVER_DECODE: True}
+        )
+
+    async def hset_many(
+        self, key: str, mapping: dict[str, str | bytes], ttl: int | None = None
+    ) -> None:
+        """
+        Set several hash fields and refresh the key's TTL in one round trip.
+        """
+        if not mapping:
+            return
+        async with self.client.pipeline(transaction=False) as pipe:
+            pipe.hset(key, mapping=mapping)
+            if ttl:
+                pipe.expire(key, ttl)
+            await pipe.execute()
+
+    async def lrange(self, key: str, start: int = 0, end: int = -1) -> list[str]:
+        """Get a range of list elements (the whole list by default)"""
+        return await self.client.lrange(key, start, end)
+
+    async def push_capped(
+        self, key: str, values: list[str], maxlen: int, ttl: int | None = None
+    ) -> None:
+        """
+        Push values to the head of a list and trim it to its newest `maxlen`
+        entries, in one round trip. The trim happens server-side, so no
+        read-modify-write is needed.
+        """
+        if not values:
+            return
+        async with self.client.pipeline(transaction=False) as pipe:
+            pipe.lpush(key, *values)
+            pipe.ltrim(key, 0, maxlen - 1)
+            if ttl:
+                pipe.expire(key, ttl)
+            await pipe.execute()
+
+    async def get_json(self, key: str) -> Any | None:
+        """Get and decode a JSON value (None if the key is missing)"""
+        value = await self.client.get(key)
+        return loads(value) if value else None
+
+    async def set_json(self, key: str, value: Any, ttl: int = None) -> bool:
+        """Encode a value as JSON and set it with an optional TTL"""
+        return await self.set(key, dumps_str(value), ttl=ttl)
+
     async def delete(self, *keys: str):
         """Delete one or more keys"""
         if keys:
             await self.client.delete(*keys)
 
+    async def acquire_lock_and_get_state(
+        self,
+        lock_key: str,
+        state_key: str,
+        token: str,
+        ttl: int,
+        field: str | None = None,
+    ) -> tuple[bool, str | None]:
+        """
+        Try to take a lock and read a state key in one round-trip.
+
+        The two commands are independent, so they are pipelined without
+        a MULTI/EXEC transaction. With `field`, the state is read from that
+        field of the hash at `state_key`.
+
+        Returns:
+            (acquired, state) - state is returned even if the lock is held
+        """
+        async with self.client.pipeline(transaction=False) as pipe:
+            pipe.set(lock_key, token, ex=ttl, nx=True)
+            if field is None:
+                pipe.get(state_key)
+            else:
+                pipe.hget(state_key, field)
+            acquired, state = await pipe.execute()
+        return bool(acquired), state
+
+    async def release_lock(self, key: str, token: str) -> bool:
+        """
+        Release a lock only if it is still held with the given token.
+
+        Returns:
+            bool: True if the lock was deleted, False if it expired or
+            was taken over by another holder
+        """
+        result = await self._release_lock_script(keys=[key], args=[token])
+        return bool(result)
+
     async def keys(self, pattern: str = "*") -> list[str]:
         """Get keys matching pattern"""
         return await self.client.keys(pattern)
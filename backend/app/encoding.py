@@ -0,0 +1,75 @@
+"""
+Shared JSON encoding helpers backed by orjson
+"""
+
+import functools
+from typing import Any
+
+import orjson
+
+try:
+    import zstandard
+except ImportError:  # Optional: packed payloads are stored uncompressed
+    zstandard = None
+
+
+def _default(obj: Any) -> Any:
+    """Fallback for types orjson does not serialize natively."""
+    if hasattr(obj, "model_dump"):
+        return obj.model_dump()
+    return str(obj)
+
+
+# Configured once at import instead of building encoder state per call
+_DUMPS = functools.partial(
+    orjson.dumps,
+    default=_default,
+    option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS,
+)
+
+loads = orjson.loads
+
+
+def dumps(obj: Any) -> bytes:
+    """Serialize an object to JSON bytes."""
+    return _DUMPS(obj)
+
+
+def dumps_str(obj: Any) -> str:
+    """Serialize an object to a JSON string (text frames, Redis values)."""
+    return _DUMPS(obj).decode()
+
+
+# Packed payloads larger than this are zstd-compressed
+COMPRESS_THRESHOLD = 2048
+
+_RAW = b"R"
+_ZSTD = b"Z"
+# One compressor/decompressor per process (used from the event loop only)
+_COMPRESSOR = zstandard.ZstdCompressor(level=3) if zstandard else None
+_DECOMPRESSOR = zstandard.ZstdDecompressor() if zstandard else None
+
+
+def pack(data: bytes | str) -> bytes:
+    """
+    Tag a payload for binary storage, zstd-compressing it when it is large.
+
+    The first byte records the encoding so unpack() is symmetric.
+    """
+    if isinstance(data, str):
+        data = data.encode()
+    if _COMPRESSOR is not None and len(data) > COMPRESS_THRESHOLD:
+        return _ZSTD + _COMPRESSOR.compress(data)
+    return _RAW + data
+
+
+def unpack(blob: bytes) -> bytes:
+    """Inverse of pack(). Untagged (legacy JSON) payloads pass through."""
+    tag = blob[:1]
+    if tag == _ZSTD:
+        if _DECOMPRESSOR is None:
+            raise ValueError("zstd payload but zstandard is not installed")
+        return _DECOMPRESSOR.decompress(blob[1:])
+    if tag == _RAW:
+        return blob[1:]
+    return blob
@@ -2,27 +2,43 @@
 Gen UI Backend - FastAPI Application Entry Point
 """
 
+import asyncio
+import atexit
+import queue
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.responses import JSONResponse
 from sse_starlette.sse import EventSourceResponse
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 import logging
-import time
+import logging.handlers
 
 from app.config import settings
+from app.encoding import dumps, loads
 from app.db.mongo_client import mongo_client
 from app.db.redis_client import redis_client
 from app.api.endpoints import router as api_router
-from app.api.events import router as events_router
+from app.api import events as events_api
+from app.api.events import router as events_router, telemetry_pool
+from app.models.events import EventBatch, TelemetryEvent
 from app.sse.publisher import sse_publisher
 from app.websocket.manager import manager
 from app.websocket.handlers import handle_websocket_connection
 
-# Configure logging
+# Configure logging. Request handlers only enqueue records; timestamp
+# formatting and the blocking stream write happen on the listener thread.
+_log_queue: queue.SimpleQueue = queue.SimpleQueue()
+_log_stream = logging.StreamHandler()
+_log_stream.setFormatter(logging.Formatter("%(asctime)s - %(levelname)s - %(message)s"))
+_log_listener = logging.handlers.QueueListener(_log_queue, _log_stream)
+_log_listener.start()
+atexit.register(_log_listener.stop)  # Flush queued records on exit
 logging.basicConfig(
     level=logging.DEBUG if settings.DEBUG else logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(message)s",
+    handlers=[logging.handlers.QueueHandler(_log_queue)],
 )
 logger = logging.getLogger(__name__)
 
@@ -34,6 +50,89 @@ logging.getLogger("sse_starlette").setLevel(logging.WARNING)
 logging.getLogger("httpx").setLevel(logging.WARNING)
 
 
+def _warm_local_paths() -> None:
+    """Run one synthetic batch through validation and the motor transform."""
+    batch = EventBatch(
+        session_id="__warmup__",
+        device_type="desktop",
+        timestamp=0,
+        events=[TelemetryEvent(ts=0, type="hover", target_id="__warmup__")],
+        motor={
+            "session_id": "__warmup__",
+            "device": "mouse",
+            "t0": 0,
+            "dt": 16,
+            "samples": [[0, 0], [1, 1], [2, 2]],
+        },
+    )
+    events_api.classify_motor_state(events_api.transform_motor_samples(batch.motor))
+
+
+async def warmup() -> None:
+    """
+    Prime connection pools and local code paths before real traffic.
+
+    Opens MONGODB_MIN_POOL_SIZE sockets with concurrent pings and pushes one
+    synthetic batch through validation and the motor transform. The agent
+    graph calls a paid LLM, so it only runs when STARTUP_WARMUP_AGENT is set.
+    """
+    try:
+        _warm_local_paths()
+    except Exception as e:
+        logger.warning(f"Local warmup failed: {e}")
+
+    tasks = []
+    if mongo_client.is_connected:
+        tasks.extend(
+            mongo_client.client.admin.command("ping")
+            for _ in range(max(settings.MONGODB_MIN_POOL_SIZE, 1))
+        )
+    if redis_client._connected:
+        tasks.append(redis_client.client.ping())
+    if settings.STARTUP_WARMUP_AGENT and events_api.run_layout_generation:
+        tasks.append(
+            events_api.run_layout_generation(
+                session_id="__warmup__",
+                telemetry_batch=[],
+                interactions=[],
+                loud_module_events=[],
+                current_preferences={},
+            )
+        )
+
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    failures = [r for r in results if isinstance(r, Exception)]
+    if failures:
+        logger.warning(f"Warmup finished with {len(failures)} failures: {failures[0]}")
+
+
+async def connect_mongo() -> None:
+    """Connect to MongoDB and start the buffered motor and snapshot writers."""
+    await mongo_client.connect()
+    mongo_client.motor_buffer.start(mongo_client.db)
+    mongo_client.snapshot_buffer.start(mongo_client.db)
+
+
+async def connect_redis() -> None:
+    """Connect to Redis and clear stale agent locks from previous runs/crashes."""
+    await redis_client.connect()
+    try:
+        lock_keys = await redis_client.keys("agent_lock:*")
+        if lock_keys:
+            await redis_client.delete(*lock_keys)
+            logger.info(f"Cleared {len(lock_keys)} stale agent locks")
+    except Exception as e:
+        logger.warning(f"Failed to clear stale locks: {e}")
+
+
+async def init_vector_store() -> None:
+    """Initialize the vector store for module matching."""
+    logger.info("Initializing vector store...")
+    from app.vector import initialize_vector_store_async
+
+    await initialize_vector_store_async()
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """
@@ -45,35 +144,31 @@ async def lifespan(app: FastAPI):
     # =========================================
     logger.info("Starting Gen UI Backend...")
 
-    # Connect to MongoDB
-    try:
-        await mongo_client.connect()
-    except Exception as e:
-        logger.error(f"Failed to connect to MongoDB: {e}")
-        # Continue without MongoDB for graceful degradation
+    # Mongo, Redis and the vector store are independent, so bring them up
+    # concurrently; startup takes max() of their latencies instead of sum()
+    results = await asyncio.gather(
+        connect_mongo(),
+        connect_redis(),
+        init_vector_store(),
+        return_exceptions=True,
+    )
+    for service, result in zip(("MongoDB", "Redis", "vector store"), results):
+        # Continue without the failed service for graceful degradation
+        if isinstance(result, Exception):
+            logger.error(f"Failed to initialize {service}: {result}")
 
-    # Connect to Redis
-    try:
-        await redis_client.connect()
-        # Clear any stale agent locks from previous sessions/crashes
+    if settings.STARTUP_WARMUP_ENABLED:
         try:
-            lock_keys = await redis_client.keys("agent_lock:*")
-            if lock_keys:
-                await redis_client.delete(*lock_keys)
-                logger.info(f"Cleared {len(lock_keys)} stale agent locks")
-        except Exception as e:
-            logger.warning(f"Failed to clear stale locks: {e}")
-    except Exception as e:
-        logger.error(f"Failed to connect to Redis: {e}")
-
-    # Initialize vector store for module matching
-    try:
-        logger.info("Initializing vector store...")
-        from app.vector import initialize_vector_store_async
+            await asyncio.wait_for(
+                warmup(), timeout=settings.STARTUP_WARMUP_TIMEOUT_SECONDS
+            )
+            logger.info("Warmup complete")
+        except asyncio.TimeoutError:
+            logger.warning("Warmup timed out, continuing startup")
 
-        await initialize_vector_store_async()
-    except Exception as e:
-        logger.warning(f"Failed to initialize vector store: {e}")
+    # Start background telemetry consumers and the SSE flush tick
+    telemetry_pool.start()
+    sse_publisher.start()
 
     logger.info("Gen UI Backend started successfully")
 
@@ -84,18 +179,31 @@ async def lifespan(app: FastAPI):
     # =========================================
     logger.info("Shutting down Gen UI Backend...")
 
+    # Drain telemetry first so its motor docs reach the buffered writer
+    await telemetry_pool.stop()
+    await sse_publisher.stop()
+    await mongo_client.motor_buffer.stop()
+    await mongo_client.snapshot_buffer.stop()
     await mongo_client.disconnect()
     await redis_client.disconnect()
 
     logger.info("Gen UI Backend shutdown complete")
 
 
+class EncodedJSONResponse(JSONResponse):
+    """JSON response rendered with the shared orjson encoder (app.encoding)."""
+
+    def render(self, content) -> bytes:
+        return dumps(content)
+
+
 # Create FastAPI application
 app = FastAPI(
     title="Gen UI Backend",
     description="AI-powered self-evolving storefront backend",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=EncodedJSONResponse,
 )
 
 # =========================================
@@ -113,14 +221,53 @@ app.add_middleware(
 
 
 # Request timing middleware
-@app.middleware("http")
-async def add_process_time_header(request: Request, call_next):
-    """Add X-Process-Time header to all responses"""
-    start_time = time.perf_counter()
-    response = await call_next(request)
-    process_time = time.perf_counter() - start_time
-    response.headers["X-Process-Time"] = f"{process_time:.4f}"
-    return response
+class ProcessTimeMiddleware:
+    """
+    Add X-Process-Time header to all responses.
+
+    Pure ASGI middleware: the header is injected into the response start
+    message, avoiding BaseHTTPMiddleware's per-request task and stream
+    wrapping (which also interferes with SSE streaming).
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+
+        async def send_with_time(message: Message):
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers.append("X-Process-Time", "%.4f" % (loop.time() - start))
+            await send(message)
+
+        await self.app(scope, receive, send_with_time)
+
+
+app.add_middleware(ProcessTimeMiddleware)
+
+
+class NonStreamingGZipMiddleware(GZipMiddleware):
+    """
+    GZip JSON responses but leave the SSE stream alone: a gzip stream only
+    emits output once its compressor buffer fills, which would hold back
+    individual layout events.
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] == "http" and scope["path"].startswith("/stream/"):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+
+app.add_middleware(NonStreamingGZipMiddleware, minimum_size=512)
 
 
 # =========================================
@@ -136,14 +283,37 @@ app.include_router(events_router, prefix="/telemetry", tags=["Telemetry"])
 # =========================================
 
 
+# Last (timestamp, (mongo_health, redis_health)) seen by /health
+_health_cache: dict = {"t": 0.0, "v": None}
+
+
+async def _cached_health() -> tuple:
+    """
+    Probe MongoDB and Redis concurrently, reusing the previous result for
+    HEALTH_CACHE_TTL_SECONDS so a burst of liveness probes hits the
+    databases once.
+    """
+    now = asyncio.get_running_loop().time()
+    if (
+        _health_cache["v"] is not None
+        and now - _health_cache["t"] < settings.HEALTH_CACHE_TTL_SECONDS
+    ):
+        return _health_cache["v"]
+
+    _health_cache["v"] = await asyncio.gather(
+        mongo_client.health_check(), redis_client.health_check()
+    )
+    _health_cache["t"] = now
+    return _health_cache["v"]
+
+
 @app.get("/health", tags=["Health"])
 async def health_check():
     """
     Health check endpoint for container orchestration.
     Returns status of all connected services.
     """
-    mongo_health = await mongo_client.health_check()
-    redis_health = await redis_client.health_check()
+    mongo_health, redis_health = await _cached_health()
 
     all_healthy = (
         mongo_health.get("status") == "connected"
@@ -156,6 +326,14 @@ async def health_check():
             "mongodb": mongo_health,
             "redis": redis_health,
         },
+        "sse": {
+            "sessions": len(sse_publisher.subscribers),
+            "dropped_events": sse_publisher.dropped_events,
+        },
+        "telemetry": {
+            "pending": telemetry_pool.pending,
+            "dropped_batches": telemetry_pool.dropped,
+        },
     }
 
 
@@ -177,13 +355,20 @@ async def root():
 @app.get("/stream/{session_id}")
 async def stream(session_id: str):
     """SSE stream for layout updates"""
-    return EventSourceResponse(sse_publisher.subscribe(session_id))
+    return EventSourceResponse(
+        sse_publisher.subscribe(session_id),
+        # Stop reverse proxies (nginx) from buffering or re-encoding events
+        headers={
+            "X-Accel-Buffering": "no",
+            "Cache-Control": "no-cache, no-transform",
+        },
+    )
 
 
 @app.post("/debug/publish_layout/{session_id}")
 async def debug_publish_layout(session_id: str, request: Request):
     """Debug endpoint to trigger layout updates for testing SSE isolation."""
-    payload = await request.json()
+    payload = loads(await request.body())
     await sse_publisher.publish_layout_update(session_id, payload)
     return {"status": "published", "session_id": session_id}
 
@@ -201,8 +386,8 @@ async def websocket_endpoint(websocket, session_id: str):
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
     """Global exception handler for unhandled errors"""
-    logger.error(f"Unhandled exception: {exc}", exc_info=True)
-    return JSONResponse(
+    logger.error("Unhandled exception: %s", exc, exc_info=True)
+    return EncodedJSONResponse(
         status_code=500,
         content={"detail": "Internal server error"},
     )
@@ -213,6 +398,25 @@ async def global_exception_handler(request: Request, exc: Exception):
 # =========================================
 
 if __name__ == "__main__":
+    import os
+
     import uvicorn
 
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # SSE subscribers, the telemetry worker pool and the motor buffer are
+    # per-process, so extra workers only make sense behind sticky sessions.
+    # WEB_CONCURRENCY follows the uvicorn/gunicorn convention.
+    uvicorn.run(
+        "app.main:app",
+        host="0.0.0.0",
+        port=8000,
+        workers=int(os.getenv("WEB_CONCURRENCY", "1")),
+        # "auto" selects uvloop/httptools when installed (uvicorn[standard])
+        loop="auto",
+        http="auto",
+        # Per-request access logging is costly; ProcessTimeMiddleware
+        # already reports request latency
+        access_log=False,
+        # No limit_concurrency: open SSE/WebSocket streams would count toward
+        # it. Telemetry load is bounded by the worker pool queue (503 when full)
+        backlog=2048,
+    )
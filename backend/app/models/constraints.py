@@ -2,8 +2,26 @@
 Constraint models for component filtering and ranking
 """
 
-from pydantic import BaseModel, Field
-from typing import Dict, List, Optional, Literal
+from types import MappingProxyType
+from pydantic import BaseModel, ConfigDict, Field
+from typing import Dict, List, Optional, Literal, Tuple
+
+# Shared read-only defaults; each model instance gets a shallow dict copy
+_DEFAULT_CORNER_RADIUS = MappingProxyType({"sharp": 0.33, "rounded": 0.34, "pill": 0.33})
+_DEFAULT_TYPOGRAPHY_WEIGHT = MappingProxyType(
+    {"light": 0.33, "regular": 0.34, "bold": 0.33}
+)
+_DEFAULT_BUTTON_SIZE = MappingProxyType({"small": 0.33, "medium": 0.34, "large": 0.33})
+_DEFAULT_GENRE_WEIGHTS = MappingProxyType(
+    {
+        "glassmorphism": 0.167,
+        "brutalism": 0.167,
+        "neumorphism": 0.167,
+        "cyberpunk": 0.167,
+        "minimalist": 0.167,
+        "monoprint": 0.167,
+    }
+)
 
 
 class HardConstraints(BaseModel):
@@ -12,13 +30,15 @@ class HardConstraints(BaseModel):
     Components not matching these are filtered out entirely.
     """
 
+    model_config = ConfigDict(frozen=True)
+
     color_scheme: Optional[Literal["dark", "light", "vibrant"]] = None
     density: Optional[Literal["low", "medium", "high"]] = None
     device_type: Optional[Literal["desktop", "mobile", "tablet"]] = None
     page_type: Optional[str] = None
 
     # Exclusion list - components to never show
-    excluded_component_ids: List[str] = Field(default_factory=list)
+    excluded_component_ids: Tuple[str, ...] = ()
 
 
 class SoftPreferences(BaseModel):
@@ -27,32 +47,27 @@ class SoftPreferences(BaseModel):
     Higher weights = stronger preference.
     """
 
+    model_config = ConfigDict(frozen=True)
+
     corner_radius: Dict[str, float] = Field(
-        default_factory=lambda: {"sharp": 0.33, "rounded": 0.34, "pill": 0.33}
+        default_factory=_DEFAULT_CORNER_RADIUS.copy
     )
     typography_weight: Dict[str, float] = Field(
-        default_factory=lambda: {"light": 0.33, "regular": 0.34, "bold": 0.33}
-    )
-    button_size: Dict[str, float] = Field(
-        default_factory=lambda: {"small": 0.33, "medium": 0.34, "large": 0.33}
+        default_factory=_DEFAULT_TYPOGRAPHY_WEIGHT.copy
     )
+    button_size: Dict[str, float] = Field(default_factory=_DEFAULT_BUTTON_SIZE.copy)
 
     # Genre preferences (glassmorphism, brutalism, neumorphism, etc.)
     genre_weights: Dict[str, float] = Field(
-        default_factory=lambda: {
-            "glassmorphism": 0.167,
-            "brutalism": 0.167,
-            "neumorphism": 0.167,
-            "cyberpunk": 0.167,
-            "minimalist": 0.167,
-            "monoprint": 0.167,
-        }
+        default_factory=_DEFAULT_GENRE_WEIGHTS.copy
     )
 
 
 class Constraints(BaseModel):
     """Combined constraints for component selection"""
 
+    model_config = ConfigDict(frozen=True)
+
     hard: HardConstraints = Field(default_factory=HardConstraints)
     soft: SoftPreferences = Field(default_factory=SoftPreferences)
     exploration_budget: float = Field(default=0.3, ge=0.0, le=1.0)
@@ -83,4 +98,4 @@ class SelectionResult(BaseModel):
     selected_components: List[ComponentCandidate]
     exploration_components: List[ComponentCandidate]  # "Loud" test components
     total_candidates_considered: int
-    selection_timestamp: float
+    selection_timestamp: int  # time.time_ns()
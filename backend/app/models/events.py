@@ -2,20 +2,28 @@
 Telemetry event models matching frontend payload
 """
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 from typing import List, Optional, Literal, Dict, Any, Union
 
+_ALLOWED_DEVICES = frozenset({"desktop", "mobile", "tablet"})
+
 
 class MotorTelemetryPayload(BaseModel):
     session_id: str
     device: Literal["mouse", "touch"]
-    t0: float
+    t0: int  # Unix epoch milliseconds of the first sample
     dt: float
     samples: List[List[float]] = Field(..., description="List of [x, y] coordinates")
 
+    @field_validator("samples")
+    @classmethod
+    def _keep_xy_pairs(cls, value: List[List[float]]) -> List[List[float]]:
+        """Trim samples to [x, y] and drop any with fewer than two coordinates."""
+        return [sample[:2] for sample in value if len(sample) >= 2]
+
 
 class TelemetryEvent(BaseModel):
-    ts: float
+    ts: int  # Unix epoch seconds
     type: str  # e.g., "click", "click_rage", "hover"
     target_id: str
     position: Optional[Dict[str, float]] = None  # {x, y}
@@ -30,10 +38,18 @@ class EventBatch(BaseModel):
 
     session_id: str
     device_type: Literal["desktop", "mobile", "tablet"]
-    timestamp: float
+    timestamp: int  # Unix epoch seconds
     events: List[TelemetryEvent]
     motor: Optional[MotorTelemetryPayload] = None
 
+    @field_validator("device_type", mode="before")
+    @classmethod
+    def _default_unknown_device(cls, value: Any) -> Any:
+        """Fall back to desktop for unrecognized device types."""
+        if isinstance(value, str) and value in _ALLOWED_DEVICES:
+            return value
+        return "desktop"
+
 
 class EventResponse(BaseModel):
     received: int
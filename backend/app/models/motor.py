@@ -0,0 +1,80 @@
+"""
+Processed motor sample models used by the telemetry pipeline
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Sequence
+
+import numpy as np
+
+
+@dataclass
+class MotorFrames:
+    """
+    Motor samples with derived velocity and acceleration, stored as
+    structure-of-arrays.
+
+    Attributes:
+        ts: (N,) sample timestamps in ms
+        pos: (N, 2) x/y positions
+        vel: (N, 2) x/y velocities in px/s (row 0 is zero)
+        acc: (N, 2) x/y accelerations in px/s^2 (rows 0-1 start from zero)
+    """
+
+    ts: np.ndarray
+    pos: np.ndarray
+    vel: np.ndarray
+    acc: np.ndarray
+
+    @classmethod
+    def empty(cls) -> "MotorFrames":
+        return cls(
+            ts=np.zeros(0),
+            pos=np.zeros((0, 2)),
+            vel=np.zeros((0, 2)),
+            acc=np.zeros((0, 2)),
+        )
+
+    def __len__(self) -> int:
+        return len(self.ts)
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """
+        Materialize the nested dict shape expected by the agent motor
+        analyzer. Only call this at the boundary to legacy consumers.
+        """
+        rows = np.column_stack((self.ts, self.pos, self.vel, self.acc)).tolist()
+        return [
+            {
+                "timestamp": t,
+                "position": {"x": x, "y": y},
+                "velocity": {"x": vx, "y": vy},
+                "acceleration": {"x": ax, "y": ay},
+            }
+            for t, x, y, vx, vy, ax, ay in rows
+        ]
+
+
+def pack_motor_samples(samples: Sequence[Sequence[float]]) -> Dict[str, Any]:
+    """
+    Column-pack [[x, y], ...] samples into raw float32 blobs for storage.
+
+    One BSON binary per axis costs 4 bytes per value instead of a nested
+    array element per coordinate.
+    """
+    if len(samples):
+        pos = np.asarray(samples, dtype=np.float32)[:, :2]
+    else:
+        pos = np.zeros((0, 2), dtype=np.float32)
+    return {
+        "n": len(pos),
+        "xs": np.ascontiguousarray(pos[:, 0]).tobytes(),
+        "ys": np.ascontiguousarray(pos[:, 1]).tobytes(),
+    }
+
+
+def unpack_motor_samples(doc: Dict[str, Any]) -> np.ndarray:
+    """Inverse of pack_motor_samples: return an (N, 2) float32 array."""
+    xs = np.frombuffer(doc["xs"], dtype=np.float32)
+    ys = np.frombuffer(doc["ys"], dtype=np.float32)
+    return np.column_stack((xs, ys))
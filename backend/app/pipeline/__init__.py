@@ -2,7 +2,7 @@
 Pipeline module exports
 """
 
-from app.pipeline.redis_keys import RedisKeys, TTL
+from app.pipeline.redis_keys import RedisKeys, SessionField, TTL
 from app.pipeline.constraint_builder import constraint_builder, ConstraintBuilder
 from app.pipeline.component_selector import component_selector, ComponentSelector
 from app.pipeline.layout_assembler import (
@@ -14,6 +14,7 @@ from app.pipeline.reducer_pipeline import reducer_pipeline, ReducerPipeline
 
 __all__ = [
     "RedisKeys",
+    "SessionField",
     "TTL",
     "constraint_builder",
     "ConstraintBuilder",
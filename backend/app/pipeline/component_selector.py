@@ -5,18 +5,22 @@ Deterministic component selection using Redis state.
 
 import logging
 import random
-from typing import List, Set, Optional
+from collections import defaultdict
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
 from app.models.constraints import (
     Constraints,
     ComponentCandidate,
     SelectionResult,
-    HardConstraints,
-    SoftPreferences,
 )
 import time
 
 logger = logging.getLogger(__name__)
 
+_EMPTY_BUCKET = np.empty(0, dtype=np.intp)
+
 
 # Component catalog (in production, this would come from a database)
 COMPONENT_CATALOG = [
@@ -116,8 +120,39 @@ class ComponentSelector:
     All data comes from Redis (no external I/O during selection).
     """
 
-    def __init__(self, catalog: List[ComponentCandidate] = None):
+    def __init__(
+        self, catalog: List[ComponentCandidate] = None, seed: Optional[int] = None
+    ):
         self.catalog = catalog or COMPONENT_CATALOG
+        # Private generator so selection can be replayed from a seed
+        self._rng = random.Random(seed)
+
+        # The catalog is read-only, so the fields used for filtering and
+        # scoring are laid out once as arrays parallel to it. select() then
+        # scores every candidate with array ops and never touches the
+        # shared candidate objects.
+        self._index = {c.component_id: i for i, c in enumerate(self.catalog)}
+        self._genre_names = sorted({c.genre for c in self.catalog})
+        genre_codes = {g: i for i, g in enumerate(self._genre_names)}
+        self._genre_idx = np.array(
+            [genre_codes[c.genre] for c in self.catalog], dtype=np.intp
+        )
+        self._semantic = np.array(
+            [c.semantic_score for c in self.catalog], dtype=np.float64
+        )
+        self._mobile = np.array([c.supports_mobile for c in self.catalog], dtype=bool)
+        # Exploratory components (cyberpunk = high visual energy)
+        self._exploratory = np.array(
+            [c.genre == "cyberpunk" for c in self.catalog], dtype=bool
+        )
+
+        # Catalog indices per type so select() only scans the buckets it needs
+        by_type: Dict[str, List[int]] = defaultdict(list)
+        for i, candidate in enumerate(self.catalog):
+            by_type[candidate.component_type].append(i)
+        self._by_type: Dict[str, np.ndarray] = {
+            t: np.array(idx, dtype=np.intp) for t, idx in by_type.items()
+        }
 
     def select(
         self,
@@ -125,6 +160,7 @@ class ComponentSelector:
         recently_used: Set[str] = None,
         vector_candidates: List[str] = None,
         required_types: List[str] = None,
+        seed: Optional[int] = None,
     ) -> SelectionResult:
         """
         Select components based on constraints.
@@ -134,101 +170,97 @@ class ComponentSelector:
             recently_used: Set of component IDs to avoid
             vector_candidates: Pre-filtered candidates from vector search (optional)
             required_types: Component types to select (e.g., ["hero", "product-grid", "cta"])
+            seed: Seed for this call's exploration draws (for deterministic replay)
 
         Returns:
             SelectionResult with selected and exploration components
         """
-        start_time = time.perf_counter()
-        recently_used = recently_used or set()
+        # Only time the call when the timing line would actually be emitted
+        timed = logger.isEnabledFor(logging.DEBUG)
+        start_time = time.perf_counter() if timed else 0.0
         required_types = required_types or ["hero", "product-grid", "cta"]
 
-        # Step 1: Filter by hard constraints
-        filtered = self._apply_hard_constraints(
-            self.catalog, constraints.hard, recently_used
-        )
+        preference, combined, allowed = self._score(constraints, recently_used)
 
-        # Step 2: Score by soft preferences
-        scored = self._score_by_preferences(filtered, constraints.soft)
+        # Draw every exploration roll up front from one generator
+        rng = random.Random(seed) if seed is not None else self._rng
+        rolls = [rng.random() for _ in required_types]
 
-        # Step 3: Select best component per type
         selected = []
         exploration = []
 
-        for comp_type in required_types:
-            type_candidates = [c for c in scored if c.component_type == comp_type]
+        for comp_type, roll in zip(required_types, rolls):
+            # Catalog indices of this type that pass the hard constraints
+            bucket = self._by_type.get(comp_type, _EMPTY_BUCKET)
+            type_candidates = bucket[allowed[bucket]]
 
-            if not type_candidates:
-                logger.warning(f"No candidates found for type: {comp_type}")
+            if not type_candidates.size:
+                logger.warning("No candidates found for type: %s", comp_type)
                 continue
 
-            # Sort by combined score (preference + semantic)
-            type_candidates.sort(
-                key=lambda c: c.preference_score + c.semantic_score, reverse=True
-            )
-
             # Apply exploration budget
-            if random.random() < constraints.exploration_budget:
+            if roll < constraints.exploration_budget:
                 # Pick an exploratory component (cyberpunk = high visual energy)
-                explore_candidates = [c for c in type_candidates if c.genre == "cyberpunk"]
-                if explore_candidates:
-                    exploration.append(explore_candidates[0])
+                loud = type_candidates[self._exploratory[type_candidates]]
+                if loud.size:
+                    explore = loud[np.argmax(combined[loud])]
+                    exploration.append(self._with_score(explore, preference))
                     continue
 
-            # Pick the best matching component
-            selected.append(type_candidates[0])
+            # Pick the best matching component (argmax keeps the first on ties)
+            best = type_candidates[np.argmax(combined[type_candidates])]
+            selected.append(self._with_score(best, preference))
 
-        selection_time = time.perf_counter() - start_time
-        logger.info(f"Component selection completed in {selection_time*1000:.2f}ms")
+        if timed:
+            logger.debug(
+                "Component selection completed in %.2fms",
+                (time.perf_counter() - start_time) * 1000,
+            )
 
         return SelectionResult(
             selected_components=selected,
             exploration_components=exploration,
             total_candidates_considered=len(self.catalog),
-            selection_timestamp=time.time(),
+            selection_timestamp=time.time_ns(),
         )
 
-    def _apply_hard_constraints(
-        self,
-        candidates: List[ComponentCandidate],
-        hard: HardConstraints,
-        recently_used: Set[str],
-    ) -> List[ComponentCandidate]:
-        """Filter candidates by hard constraints."""
-        filtered = []
-
-        for candidate in candidates:
-            # Skip recently used
-            if candidate.component_id in recently_used:
-                continue
-
-            # Skip explicitly excluded
-            if candidate.component_id in hard.excluded_component_ids:
-                continue
-
-            # Device compatibility check
-            if hard.device_type == "mobile" and not candidate.supports_mobile:
-                continue
-
-            # All checks passed
-            filtered.append(candidate)
-
-        return filtered
-
-    def _score_by_preferences(
-        self, candidates: List[ComponentCandidate], soft: SoftPreferences
-    ) -> List[ComponentCandidate]:
-        """Score candidates by soft preferences."""
-        scored = []
-
-        for candidate in candidates:
-            # Genre preference score
-            genre_score = soft.genre_weights.get(candidate.genre, 0.1)
-
-            # Combined preference score
-            candidate.preference_score = genre_score
-            scored.append(candidate)
+    def _score(
+        self, constraints: Constraints, recently_used: Optional[Set[str]]
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Score the whole catalog for one request.
 
-        return scored
+        Returns:
+            (preference, combined, allowed) arrays parallel to the catalog:
+            soft-preference scores, preference + semantic ranking scores, and
+            the hard-constraint mask
+        """
+        # Soft preferences: one lookup per genre, broadcast over the catalog
+        genre_weights = constraints.soft.genre_weights
+        genre_scores = np.array(
+            [genre_weights.get(g, 0.1) for g in self._genre_names], dtype=np.float64
+        )
+        preference = genre_scores[self._genre_idx]
+
+        # Hard constraints: device compatibility, then recently used and
+        # explicitly excluded IDs alike
+        if constraints.hard.device_type == "mobile":
+            allowed = self._mobile.copy()
+        else:
+            allowed = np.ones(len(self.catalog), dtype=bool)
+        for excluded in (recently_used or (), constraints.hard.excluded_component_ids):
+            for component_id in excluded:
+                i = self._index.get(component_id)
+                if i is not None:
+                    allowed[i] = False
+
+        return preference, preference + self._semantic, allowed
+
+    def _with_score(self, i: int, preference: np.ndarray) -> ComponentCandidate:
+        """Copy a catalog candidate with its per-request preference score."""
+        return self.catalog[i].model_copy(
+            update={"preference_score": float(preference[i])}
+        )
 
 
 # Singleton instance
@@ -4,19 +4,106 @@ Converts reducer JSON into hard constraints (filtering) and soft preferences (ra
 """
 
 import logging
-from typing import Tuple
+from types import MappingProxyType
+from typing import Dict, Mapping, Tuple
 from app.models.reducer import ReducerOutput, ReducerContext
 from app.models.constraints import HardConstraints, SoftPreferences, Constraints
 
 logger = logging.getLogger(__name__)
 
 
+def _genre_weights_for(density: str, engagement_depth: str) -> Dict[str, float]:
+    """Heuristic genre weights for one (density, engagement_depth) pair."""
+    # Start with equal weights for the 6 drafting-site genres
+    weights = {
+        "glassmorphism": 0.20,
+        "brutalism": 0.15,
+        "neumorphism": 0.15,
+        "cyberpunk": 0.15,
+        "minimalist": 0.20,
+        "monoprint": 0.15,
+    }
+
+    # Adjust based on density preference
+    if density == "low":
+        weights["minimalist"] += 0.15
+        weights["brutalism"] -= 0.10
+    elif density == "high":
+        weights["brutalism"] += 0.10
+        weights["minimalist"] -= 0.10
+
+    # Adjust based on engagement depth
+    if engagement_depth == "shallow":
+        weights["minimalist"] += 0.10
+        weights["glassmorphism"] -= 0.05
+    elif engagement_depth == "deep":
+        weights["glassmorphism"] += 0.10
+        weights["cyberpunk"] += 0.05
+
+    # Normalize to sum to 1.0
+    total = sum(weights.values())
+    return {k: round(v / total, 3) for k, v in weights.items()}
+
+
+# Both inputs are small Literal enums (VisualTraits.density,
+# BehavioralTraits.engagement_depth), so every result is computed at import
+_GENRE_WEIGHTS_LUT: Mapping[Tuple[str, str], Dict[str, float]] = MappingProxyType(
+    {
+        (density, depth): _genre_weights_for(density, depth)
+        for density in ("low", "medium", "high")
+        for depth in ("shallow", "moderate", "deep")
+    }
+)
+
+
+def _one_hot_weights(options: Tuple[str, ...]) -> Mapping[str, Dict[str, float]]:
+    """Weights per chosen option: 0.6 on the choice, 0.2 on the others."""
+    return MappingProxyType(
+        {
+            chosen: {option: 0.6 if option == chosen else 0.2 for option in options}
+            for chosen in options
+        }
+    )
+
+
+# Corner radius, typography weight and button size preferences
+_CORNER_WEIGHTS = _one_hot_weights(("sharp", "rounded", "pill"))
+_TYPOGRAPHY_WEIGHTS = _one_hot_weights(("light", "regular", "bold"))
+_BUTTON_WEIGHTS = _one_hot_weights(("small", "medium", "large"))
+
+# Distinct (traits, device, page) combinations kept by ConstraintBuilder
+CONSTRAINT_CACHE_SIZE = 1024
+
+
+def _cache_key(reducer_output: ReducerOutput, context: ReducerContext) -> tuple:
+    """
+    Hashable projection of everything build() reads. Trait fields are all
+    Literal strings; session_id and timestamp are deliberately left out.
+    """
+    return (
+        tuple(reducer_output.visual.__dict__.values()),
+        tuple(reducer_output.interaction.__dict__.values()),
+        tuple(reducer_output.behavioral.__dict__.values()),
+        context.device_type,
+        context.page_type,
+    )
+
+
 class ConstraintBuilder:
     """
     Builds constraints from reducer output.
     This is a deterministic, fast operation (no I/O).
+
+    Results are memoized in a small LRU keyed on the reducer traits, since
+    successive reducer outputs within a session often repeat verbatim.
+    Constraints are frozen, so cached instances (and their serialized JSON)
+    are safe to share.
     """
 
+    def __init__(self, cache_size: int = CONSTRAINT_CACHE_SIZE):
+        self.cache_size = cache_size
+        self._cache: Dict[tuple, Tuple[Constraints, str]] = {}
+
     def build(
         self, reducer_output: ReducerOutput, context: ReducerContext
     ) -> Constraints:
@@ -30,6 +117,32 @@ class ConstraintBuilder:
         Returns:
             Constraints object with hard and soft constraints
         """
+        return self.build_with_json(reducer_output, context)[0]
+
+    def build_with_json(
+        self, reducer_output: ReducerOutput, context: ReducerContext
+    ) -> Tuple[Constraints, str]:
+        """
+        Like build(), but also return the constraints serialized as JSON.
+
+        The JSON is cached with the constraints, so repeated reducer outputs
+        skip both the build and the model_dump_json for the Redis write.
+        """
+        key = _cache_key(reducer_output, context)
+        entry = self._cache.pop(key, None)
+        if entry is None:
+            constraints = self._build(reducer_output, context)
+            entry = (constraints, constraints.model_dump_json())
+            if len(self._cache) >= self.cache_size:
+                # Dicts keep insertion order: the first key is least recent
+                del self._cache[next(iter(self._cache))]
+        self._cache[key] = entry
+        return entry
+
+    def _build(
+        self, reducer_output: ReducerOutput, context: ReducerContext
+    ) -> Constraints:
+        """Uncached build of the hard/soft constraints."""
         hard = self._build_hard_constraints(reducer_output, context)
         soft = self._build_soft_preferences(reducer_output)
         exploration_budget = self._calculate_exploration_budget(reducer_output)
@@ -49,7 +162,7 @@ class ConstraintBuilder:
             density=visual.density,
             device_type=context.device_type,
             page_type=context.page_type,
-            excluded_component_ids=[],  # Populated from recently_used later
+            excluded_component_ids=(),  # Populated from recently_used later
         )
 
     def _build_soft_preferences(self, reducer_output: ReducerOutput) -> SoftPreferences:
@@ -58,67 +171,27 @@ class ConstraintBuilder:
         Higher values = stronger preference.
         """
         visual = reducer_output.visual
-        interaction = reducer_output.interaction
-
-        # Corner radius preferences
-        corner_weights = {"sharp": 0.2, "rounded": 0.2, "pill": 0.2}
-        corner_weights[visual.corner_radius] = 0.6
-
-        # Typography weight preferences
-        typo_weights = {"light": 0.2, "regular": 0.2, "bold": 0.2}
-        typo_weights[visual.typography_weight] = 0.6
-
-        # Button size preferences
-        button_weights = {"small": 0.2, "medium": 0.2, "large": 0.2}
-        button_weights[visual.button_size] = 0.6
-
-        # Genre weights based on behavioral patterns
-        genre_weights = self._infer_genre_weights(reducer_output)
 
         return SoftPreferences(
-            corner_radius=corner_weights,
-            typography_weight=typo_weights,
-            button_size=button_weights,
-            genre_weights=genre_weights,
+            corner_radius=_CORNER_WEIGHTS[visual.corner_radius],
+            typography_weight=_TYPOGRAPHY_WEIGHTS[visual.typography_weight],
+            button_size=_BUTTON_WEIGHTS[visual.button_size],
+            # Genre weights based on behavioral patterns
+            genre_weights=self._infer_genre_weights(reducer_output),
         )
 
     def _infer_genre_weights(self, reducer_output: ReducerOutput) -> dict:
         """
         Infer genre preferences from behavioral traits.
-        This is a heuristic mapping.
+        This is a heuristic mapping, precomputed for every input combination.
+        The returned dict is shared and must not be mutated.
         """
-        behavioral = reducer_output.behavioral
-        visual = reducer_output.visual
-
-        # Start with equal weights for the 6 drafting-site genres
-        weights = {
-            "glassmorphism": 0.20,
-            "brutalism": 0.15,
-            "neumorphism": 0.15,
-            "cyberpunk": 0.15,
-            "minimalist": 0.20,
-            "monoprint": 0.15,
-        }
-
-        # Adjust based on density preference
-        if visual.density == "low":
-            weights["minimalist"] += 0.15
-            weights["brutalism"] -= 0.10
-        elif visual.density == "high":
-            weights["brutalism"] += 0.10
-            weights["minimalist"] -= 0.10
-
-        # Adjust based on engagement depth
-        if behavioral.engagement_depth == "shallow":
-            weights["minimalist"] += 0.10
-            weights["glassmorphism"] -= 0.05
-        elif behavioral.engagement_depth == "deep":
-            weights["glassmorphism"] += 0.10
-            weights["cyberpunk"] += 0.05
-
-        # Normalize to sum to 1.0
-        total = sum(weights.values())
-        return {k: round(v / total, 3) for k, v in weights.items()}
+        return _GENRE_WEIGHTS_LUT[
+            (
+                reducer_output.visual.density,
+                reducer_output.behavioral.engagement_depth,
+            )
+        ]
 
     def _calculate_exploration_budget(self, reducer_output: ReducerOutput) -> float:
         """
@@ -4,17 +4,56 @@ Assembles layout schema from selected components and caches with hash.
 """
 
 import hashlib
-import json
 import logging
 import time
+from functools import lru_cache
+from types import MappingProxyType
 from typing import List, Optional, Dict, Any
-from pydantic import BaseModel, Field
+
+import orjson
+from pydantic import BaseModel, ConfigDict, Field
 
 from app.models.constraints import ComponentCandidate, SelectionResult
 from app.models.reducer import ReducerOutput
 
 logger = logging.getLogger(__name__)
 
+# Preference -> CSS value maps for design tokens
+_RADIUS_MAP = MappingProxyType({"sharp": "0px", "rounded": "8px", "pill": "9999px"})
+_WEIGHT_MAP = MappingProxyType({"light": "300", "regular": "400", "bold": "700"})
+_THEME_MAP = MappingProxyType({"dark": "dark", "light": "light", "vibrant": "vibrant"})
+
+# Default props per component type. Layouts get their own copy of these.
+_DEFAULT_PROPS = MappingProxyType(
+    {
+        "hero": {"title": "Welcome", "subtitle": "Discover our products"},
+        "product-grid": {"columns": 4, "limit": 12},
+        "cta": {"title": "Ready to get started?", "buttonText": "Shop Now"},
+    }
+)
+_EMPTY_PROPS: Dict[str, Any] = {}
+# Extra props marking exploration components (for A/B testing)
+_EXPLORATION_PROPS = MappingProxyType({"_is_exploration": True, "_module_loud": True})
+
+
+def _props_digest(props: Dict[str, Any]) -> bytes:
+    """Stable digest of a props dict (sorted keys)."""
+    payload = orjson.dumps(props, option=orjson.OPT_SORT_KEYS)
+    return hashlib.blake2b(payload, digest_size=16).digest()
+
+
+# Props digests for every (type, is_exploration) pair _build_components can
+# produce, so layout hashing never re-serializes the default props
+_PROPS_DIGESTS = MappingProxyType(
+    {
+        (component_type, exploration): _props_digest(
+            {**props, **_EXPLORATION_PROPS} if exploration else props
+        )
+        for component_type, props in _DEFAULT_PROPS.items()
+        for exploration in (False, True)
+    }
+)
+
 
 class LayoutComponent(BaseModel):
     """Single component in the layout schema"""
@@ -29,6 +68,9 @@ class LayoutComponent(BaseModel):
 class LayoutTokens(BaseModel):
     """Design tokens derived from preferences"""
 
+    # Frozen so one instance can be shared by every layout with the same traits
+    model_config = ConfigDict(frozen=True)
+
     theme: str = "light"
     border_radius: str = "8px"
     font_weight: str = "400"
@@ -36,6 +78,20 @@ class LayoutTokens(BaseModel):
     accent_color: str = "#3b82f6"
 
 
+@lru_cache(maxsize=256)
+def _tokens_for(
+    color_scheme: str, corner_radius: str, typography_weight: str, density: str
+) -> LayoutTokens:
+    """Map visual preferences to CSS values (memoized per trait combination)."""
+    return LayoutTokens.model_construct(
+        theme=_THEME_MAP.get(color_scheme, "light"),
+        border_radius=_RADIUS_MAP.get(corner_radius, "8px"),
+        font_weight=_WEIGHT_MAP.get(typography_weight, "400"),
+        density=density,
+        accent_color="#3b82f6",  # Could be dynamic based on preferences
+    )
+
+
 class LayoutSchema(BaseModel):
     """
     Complete layout schema for frontend rendering.
@@ -50,6 +106,21 @@ class LayoutSchema(BaseModel):
     tokens: LayoutTokens
     metadata: Dict[str, Any] = Field(default_factory=dict)
 
+    @classmethod
+    def from_trusted_json(cls, data: bytes | str) -> "LayoutSchema":
+        """
+        Rebuild a schema from JSON this service serialized itself.
+
+        The nested models are constructed directly, skipping validation;
+        never use this on client-supplied input.
+        """
+        fields = orjson.loads(data)
+        fields["components"] = [
+            LayoutComponent.model_construct(**c) for c in fields["components"]
+        ]
+        fields["tokens"] = LayoutTokens.model_construct(**fields["tokens"])
+        return cls.model_construct(**fields)
+
 
 class LayoutAssembler:
     """
@@ -90,9 +161,9 @@ class LayoutAssembler:
 
         # Check if layout changed
         if previous_hash and layout_hash == previous_hash:
-            logger.info(f"Layout unchanged (hash: {layout_hash[:8]}...)")
+            logger.debug("Layout unchanged (hash: %.8s...)", layout_hash)
 
-        schema = LayoutSchema(
+        schema = LayoutSchema.model_construct(
             layout_id=layout_id,
             layout_hash=layout_hash,
             session_id=session_id,
@@ -106,39 +177,47 @@ class LayoutAssembler:
             },
         )
 
-        logger.info(
-            f"Layout assembled: {len(components)} components, hash: {layout_hash[:8]}..."
+        logger.debug(
+            "Layout assembled: %d components, hash: %.8s...",
+            len(components),
+            layout_hash,
         )
         return schema
 
     def _build_components(self, selection: SelectionResult) -> List[LayoutComponent]:
-        """Convert selected components to layout components."""
+        """
+        Convert selected components to layout components.
+
+        Candidates are already validated, so the layout models are built with
+        model_construct and skip a second round of field validation.
+        """
         components = []
 
         # Add selected components
         for candidate in selection.selected_components:
             components.append(
-                LayoutComponent(
+                LayoutComponent.model_construct(
                     id=candidate.component_id,
                     type=candidate.component_type,
                     variant=candidate.variant,
                     genre=candidate.genre,
-                    props=self._default_props_for_type(candidate.component_type),
+                    props=dict(
+                        self._default_props_for_type(candidate.component_type)
+                    ),
                 )
             )
 
         # Add exploration components (marked for A/B testing)
         for candidate in selection.exploration_components:
             components.append(
-                LayoutComponent(
+                LayoutComponent.model_construct(
                     id=candidate.component_id,
                     type=candidate.component_type,
                     variant=candidate.variant,
                     genre=candidate.genre,
                     props={
                         **self._default_props_for_type(candidate.component_type),
-                        "_is_exploration": True,
-                        "_module_loud": True,
+                        **_EXPLORATION_PROPS,
                     },
                 )
             )
@@ -148,42 +227,47 @@ class LayoutAssembler:
     def _extract_tokens(self, reducer_output: ReducerOutput) -> LayoutTokens:
         """Extract design tokens from reducer output."""
         visual = reducer_output.visual
-
-        # Map preferences to CSS values
-        radius_map = {"sharp": "0px", "rounded": "8px", "pill": "9999px"}
-        weight_map = {"light": "300", "regular": "400", "bold": "700"}
-        theme_map = {"dark": "dark", "light": "light", "vibrant": "vibrant"}
-
-        return LayoutTokens(
-            theme=theme_map.get(visual.color_scheme, "light"),
-            border_radius=radius_map.get(visual.corner_radius, "8px"),
-            font_weight=weight_map.get(visual.typography_weight, "400"),
-            density=visual.density,
-            accent_color="#3b82f6",  # Could be dynamic based on preferences
+        return _tokens_for(
+            visual.color_scheme,
+            visual.corner_radius,
+            visual.typography_weight,
+            visual.density,
         )
 
     def _default_props_for_type(self, component_type: str) -> Dict[str, Any]:
         """Get default props for a component type."""
-        defaults = {
-            "hero": {"title": "Welcome", "subtitle": "Discover our products"},
-            "product-grid": {"columns": 4, "limit": 12},
-            "cta": {"title": "Ready to get started?", "buttonText": "Shop Now"},
-        }
-        return defaults.get(component_type, {})
+        return _DEFAULT_PROPS.get(component_type, _EMPTY_PROPS)
 
     def _compute_hash(
         self, components: List[LayoutComponent], tokens: LayoutTokens
     ) -> str:
-        """Compute a deterministic hash of the layout."""
-        # Create a stable representation
-        hash_data = {
-            "components": [c.model_dump() for c in components],
-            "tokens": tokens.model_dump(),
-        }
-
-        # Sort keys for determinism
-        json_str = json.dumps(hash_data, sort_keys=True)
-        return hashlib.sha256(json_str.encode()).hexdigest()
+        """
+        Compute a deterministic hash of the layout.
+
+        Components are expected to come from _build_components, whose props
+        are a function of (type, is_exploration), so their precomputed
+        digest stands in for the props. Unknown types are digested directly.
+        """
+        # Change detection only, not authentication: BLAKE2b is cheaper than
+        # SHA-256 and keeps the same 64-char hex digest
+        hasher = hashlib.blake2b(digest_size=32)
+        for c in components:
+            hasher.update("\x1f".join((c.id, c.type, c.variant, c.genre)).encode())
+            digest = _PROPS_DIGESTS.get((c.type, "_is_exploration" in c.props))
+            hasher.update(digest if digest is not None else _props_digest(c.props))
+            hasher.update(b"\x1e")
+        hasher.update(
+            "\x1f".join(
+                (
+                    tokens.theme,
+                    tokens.border_radius,
+                    tokens.font_weight,
+                    tokens.density,
+                    tokens.accent_color,
+                )
+            ).encode()
+        )
+        return hasher.hexdigest()
 
 
 # Singleton instance
@@ -0,0 +1,27 @@
+"""
+Motor Kernels Module
+Finite-difference velocity/acceleration kernels for motor telemetry.
+"""
+
+from typing import Tuple
+
+import numpy as np
+
+
+def motor_diffs(pos: np.ndarray, dt_sec: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Compute per-sample velocity and acceleration from positions.
+
+    Args:
+        pos: (N, 2) float64 array of x/y positions
+        dt_sec: Sample interval in seconds
+
+    Returns:
+        (velocity, acceleration) arrays shaped like pos; row 0 is zero.
+    """
+    inv_dt = 1.0 / dt_sec if dt_sec > 0 else 0.0
+    vel = np.zeros_like(pos)
+    acc = np.zeros_like(pos)
+    vel[1:] = (pos[1:] - pos[:-1]) * inv_dt
+    acc[1:] = (vel[1:] - vel[:-1]) * inv_dt
+    return vel, acc
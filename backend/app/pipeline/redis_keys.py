@@ -13,6 +13,9 @@ class TTL:
     CANDIDATES = 5 * 60  # 5 minutes
     LAYOUT = 30 * 60  # 30 minutes
     RECENTLY_USED = 30 * 60  # 30 minutes
+    AGENT_SIGNATURE = 5 * 60  # 5 minutes
+    AGENT_CACHE = 10 * 60  # 10 minutes
+    VECTOR_CACHE = 30 * 60  # 30 minutes
 
 
 class RedisKeys:
@@ -22,14 +25,9 @@ class RedisKeys:
     """
 
     @staticmethod
-    def state(session_id: str) -> str:
-        """Latest reducer output JSON"""
-        return f"session:{session_id}:state"
-
-    @staticmethod
-    def constraints(session_id: str) -> str:
-        """Derived hard/soft constraints JSON"""
-        return f"session:{session_id}:constraints"
+    def session(session_id: str) -> str:
+        """Hash bundling the session's pipeline state (fields: SessionField)"""
+        return f"session:{session_id}"
 
     @staticmethod
     def exploration_budget(session_id: str) -> str:
@@ -46,16 +44,6 @@ class RedisKeys:
         """Final selected component IDs (JSON list)"""
         return f"session:{session_id}:selected"
 
-    @staticmethod
-    def layout_hash(session_id: str) -> str:
-        """Hash of current layout for change detection"""
-        return f"session:{session_id}:layout_hash"
-
-    @staticmethod
-    def layout(session_id: str) -> str:
-        """Cached layout schema JSON"""
-        return f"session:{session_id}:layout"
-
     @staticmethod
     def recently_used(session_id: str) -> str:
         """Set of recently shown component IDs"""
@@ -66,18 +54,46 @@ class RedisKeys:
         """Current motor state (velocity, acceleration, cognitive state)"""
         return f"session:{session_id}:motor_state"
 
+    @staticmethod
+    def agent_signature(session_id: str) -> str:
+        """Signature of the last batch the agent workflow ran on"""
+        return f"session:{session_id}:agent_sig"
+
+    @staticmethod
+    def agent_cache(fingerprint: str) -> str:
+        """Agent output for a coarse profile fingerprint (shared across sessions)"""
+        return f"agent_cache:{fingerprint}"
+
+    @staticmethod
+    def vector_cache(fingerprint: str) -> str:
+        """Vector search top-K for an intent fingerprint (shared across sessions)"""
+        return f"vector_cache:{fingerprint}"
+
+
+class SessionField:
+    """
+    Fields of the RedisKeys.session hash. They share the hash's single
+    TTL (TTL.SESSION), refreshed on every write.
+    """
+
+    STATE = "state"  # Latest reducer output JSON
+    CONSTRAINTS = "constraints"  # Derived hard/soft constraints JSON
+    LAYOUT = "layout"  # Cached layout schema (packed JSON)
+    LAYOUT_HASH = "layout_hash"  # Hash of current layout for change detection
+
 
 # Key metadata for documentation
 KEY_SCHEMA = {
-    "session:{id}:state": {
+    "session:{id}": {
         "ttl": TTL.SESSION,
-        "type": "json",
-        "purpose": "Latest reducer output",
-    },
-    "session:{id}:constraints": {
-        "ttl": TTL.SESSION,
-        "type": "json",
-        "purpose": "Hard/soft constraints",
+        "type": "hash",
+        "purpose": "Session bundle",
+        "fields": {
+            SessionField.STATE: "Latest reducer output (json)",
+            SessionField.CONSTRAINTS: "Hard/soft constraints (json)",
+            SessionField.LAYOUT: "Cached layout schema (packed_json, zstd when large)",
+            SessionField.LAYOUT_HASH: "BLAKE2b of layout (string)",
+        },
     },
     "session:{id}:exploration_budget": {
         "ttl": TTL.SESSION,
@@ -94,19 +110,24 @@ KEY_SCHEMA = {
         "type": "json_list",
         "purpose": "Final component IDs",
     },
-    "session:{id}:layout_hash": {
-        "ttl": TTL.LAYOUT,
+    "session:{id}:recently_used": {
+        "ttl": TTL.RECENTLY_USED,
+        "type": "list",
+        "purpose": "Recent component IDs, newest first",
+    },
+    "session:{id}:agent_sig": {
+        "ttl": TTL.AGENT_SIGNATURE,
         "type": "string",
-        "purpose": "SHA256 of layout",
+        "purpose": "Last agent input signature",
     },
-    "session:{id}:layout": {
-        "ttl": TTL.LAYOUT,
+    "agent_cache:{fingerprint}": {
+        "ttl": TTL.AGENT_CACHE,
         "type": "json",
-        "purpose": "Cached layout schema",
+        "purpose": "Cached agent output",
     },
-    "session:{id}:recently_used": {
-        "ttl": TTL.RECENTLY_USED,
-        "type": "set",
-        "purpose": "Component ID set",
+    "vector_cache:{fingerprint}": {
+        "ttl": TTL.VECTOR_CACHE,
+        "type": "json_list",
+        "purpose": "Cached vector search top-K",
     },
 }
@@ -5,17 +5,20 @@ Implements the 5-step workflow with proper blocking/non-blocking separation.
 """
 
 import asyncio
-import json
+import hashlib
 import logging
 import time
-from typing import Optional, Set
-from datetime import datetime
+from typing import Optional, Set, Tuple
+from datetime import datetime, timezone
+
+from redis.exceptions import ResponseError
 
 from app.db.redis_client import redis_client
 from app.db.mongo_client import mongo_client
+from app.encoding import dumps_str, pack, unpack
 from app.models.reducer import ReducerOutput, ReducerContext, ReducerPayload
 from app.models.constraints import Constraints
-from app.pipeline.redis_keys import RedisKeys, TTL
+from app.pipeline.redis_keys import RedisKeys, SessionField, TTL
 from app.pipeline.constraint_builder import constraint_builder
 from app.pipeline.component_selector import component_selector
 from app.pipeline.layout_assembler import layout_assembler, LayoutSchema
@@ -23,13 +26,36 @@ from app.pipeline.layout_assembler import layout_assembler, LayoutSchema
 logger = logging.getLogger(__name__)
 
 
+# Module IDs kept per vector search
+VECTOR_TOP_K = 5
+
+# Component IDs kept in the session's recently used list
+RECENTLY_USED_LIMIT = 20
+
+
+def semantic_intent(output: ReducerOutput) -> str:
+    """Natural-language intent for the reducer traits, embedded for search."""
+    visual = output.visual
+    interaction = output.interaction
+    behavioral = output.behavioral
+    return (
+        f"A {visual.color_scheme} {visual.density}-density layout with "
+        f"{visual.corner_radius} corners, {visual.typography_weight} typography "
+        f"and {visual.button_size} buttons. The user has "
+        f"{interaction.exploration_tolerance} exploration tolerance, "
+        f"{interaction.scroll_behavior} scrolling, "
+        f"{behavioral.engagement_depth} engagement and favours "
+        f"{behavioral.speed_vs_accuracy}."
+    )
+
+
 class ReducerPipeline:
     """
     Orchestrates the post-reducer processing pipeline.
 
     Flow:
-    1. Redis Write (BLOCKING) - Store reducer state
-    2. Fan-Out (PARALLEL) - Constraints, Vector Search, MongoDB
+    1. Redis Write (BLOCKING) - Store reducer state and constraints
+    2. Fan-Out (PARALLEL) - Vector Search, MongoDB
     3. Component Selection - Deterministic selection
     4. Layout Assembly - Build schema
     5. Output - Return layout schema
@@ -51,33 +77,39 @@ class ReducerPipeline:
         start_time = time.perf_counter()
         session_id = payload.context.session_id
 
-        logger.info(f"[Pipeline] Starting for session: {session_id}")
+        logger.debug("[Pipeline] Starting for session: %s", session_id)
 
         # ========================================
         # STEP 1: Redis Write (BLOCKING)
         # ========================================
-        await self._write_session_state(session_id, payload.output)
+        # Build constraints synchronously (fast, no I/O) so the reducer state
+        # and constraints go out in one round trip. The selection state read
+        # for Step 3 touches other fields, so it is issued concurrently rather
+        # than waiting behind the write.
+        constraints, constraints_json = constraint_builder.build_with_json(
+            payload.output, payload.context
+        )
+        session_key = RedisKeys.session(session_id)
+        _, (recently_used, previous_hash) = await asyncio.gather(
+            redis_client.hset_many(
+                session_key,
+                {
+                    SessionField.STATE: payload.output.model_dump_json(),
+                    SessionField.CONSTRAINTS: constraints_json,
+                },
+                TTL.SESSION,
+            ),
+            self._read_selection_state(session_id),
+        )
         step1_time = time.perf_counter()
-        logger.debug(f"[Step 1] Redis write: {(step1_time - start_time)*1000:.2f}ms")
+        logger.debug("[Step 1] Redis write: %.2fms", (step1_time - start_time) * 1000)
 
         # ========================================
         # STEP 2: Parallel Fan-Out (NON-BLOCKING)
         # ========================================
-        # Build constraints synchronously (fast, no I/O)
-        constraints = constraint_builder.build(payload.output, payload.context)
-
-        # Store constraints in Redis
-        await redis_client.set(
-            RedisKeys.constraints(session_id),
-            constraints.model_dump_json(),
-            ttl=TTL.SESSION,
-        )
-
-        # Fire and forget: MongoDB persistence (don't await)
+        # MongoDB persistence: queued on the buffered writer (no I/O here)
         if not skip_persistence:
-            asyncio.create_task(
-                self._persist_to_mongodb(session_id, payload, constraints)
-            )
+            await self._persist_to_mongodb(session_id, payload, constraints)
 
         # Fire and forget: Vector search (don't await)
         asyncio.create_task(
@@ -85,36 +117,25 @@ class ReducerPipeline:
         )
 
         step2_time = time.perf_counter()
-        logger.debug(f"[Step 2] Fan-out setup: {(step2_time - step1_time)*1000:.2f}ms")
+        logger.debug(
+            "[Step 2] Fan-out setup: %.2fms", (step2_time - step1_time) * 1000
+        )
 
         # ========================================
         # STEP 3: Component Selection
         # ========================================
-        recently_used = await self._get_recently_used(session_id)
-
         selection = component_selector.select(
             constraints=constraints,
             recently_used=recently_used,
             required_types=["hero", "product-grid", "cta"],
         )
 
-        # Update recently used set
-        await self._update_recently_used(session_id, selection)
-
-        # Store selection in Redis
-        selected_ids = [c.component_id for c in selection.selected_components]
-        await redis_client.set(
-            RedisKeys.selected(session_id), json.dumps(selected_ids), ttl=TTL.CANDIDATES
-        )
-
         step3_time = time.perf_counter()
-        logger.debug(f"[Step 3] Selection: {(step3_time - step2_time)*1000:.2f}ms")
+        logger.debug("[Step 3] Selection: %.2fms", (step3_time - step2_time) * 1000)
 
         # ========================================
         # STEP 4: Layout Assembly
         # ========================================
-        previous_hash = await redis_client.get(RedisKeys.layout_hash(session_id))
-
         layout = layout_assembler.assemble(
             session_id=session_id,
             selection=selection,
@@ -122,51 +143,75 @@ class ReducerPipeline:
             previous_hash=previous_hash,
         )
 
-        # Cache layout in Redis
-        await redis_client.set(
-            RedisKeys.layout(session_id), layout.model_dump_json(), ttl=TTL.LAYOUT
-        )
-        await redis_client.set(
-            RedisKeys.layout_hash(session_id), layout.layout_hash, ttl=TTL.LAYOUT
+        # Selection and layout cache written concurrently; the recently used
+        # list is pushed and trimmed server-side alongside them. The selection
+        # keeps its own key so it expires on the short TTL.CANDIDATES rather
+        # than the session hash's TTL. Only IDs not already in the list are
+        # pushed, so a stable selection adds nothing to it.
+        selected_ids = [c.component_id for c in selection.selected_components]
+        new_ids = [i for i in selected_ids if i not in recently_used]
+        await asyncio.gather(
+            redis_client.set(
+                RedisKeys.selected(session_id),
+                dumps_str(selected_ids),
+                ex=TTL.CANDIDATES,
+            ),
+            redis_client.hset_many(
+                session_key,
+                {
+                    SessionField.LAYOUT: pack(layout.model_dump_json()),
+                    SessionField.LAYOUT_HASH: layout.layout_hash,
+                },
+                TTL.SESSION,
+            ),
+            self._update_recently_used(session_id, new_ids),
         )
 
         step4_time = time.perf_counter()
-        logger.debug(f"[Step 4] Assembly: {(step4_time - step3_time)*1000:.2f}ms")
+        logger.debug("[Step 4] Assembly: %.2fms", (step4_time - step3_time) * 1000)
 
         # ========================================
         # STEP 5: Output
         # ========================================
         total_time = (time.perf_counter() - start_time) * 1000
         logger.info(
-            f"[Pipeline] Complete in {total_time:.2f}ms (session: {session_id})"
+            "[Pipeline] Complete in %.2fms (session: %s)", total_time, session_id
         )
 
         return layout
 
-    async def _write_session_state(self, session_id: str, output: ReducerOutput):
-        """Step 1: Write reducer state to Redis (blocking)."""
-        await redis_client.set(
-            RedisKeys.state(session_id), output.model_dump_json(), ttl=TTL.SESSION
-        )
-
     async def _persist_to_mongodb(
         self, session_id: str, payload: ReducerPayload, constraints: Constraints
     ):
-        """Step 2C: Append snapshot to MongoDB (non-blocking background task)."""
+        """
+        Step 2C: Persist a reducer snapshot to MongoDB.
+
+        Snapshots go through the buffered writer, which batches them into
+        one acknowledged insert_many per flush instead of an insert_one per
+        request. Outside the app lifespan (scripts, tests) the writer is not
+        running, so the snapshot is inserted directly instead of dropped:
+        these docs are the long-context history the agents read back.
+        """
         try:
             doc = {
                 "session_id": session_id,
                 "page_type": payload.context.page_type,
                 "device_type": payload.context.device_type,
-                "timestamp": datetime.utcnow(),
+                # BSON Date: the 24h TTL index on "timestamp" only expires dates
+                "timestamp": datetime.now(timezone.utc),
                 "reducer_output": payload.output.model_dump(),
                 "constraints_summary": {
                     "hard": constraints.hard.model_dump(),
                     "exploration_budget": constraints.exploration_budget,
                 },
             }
-            await mongo_client.db.reducer_snapshots.insert_one(doc)
-            logger.debug(f"[MongoDB] Persisted snapshot for {session_id}")
+            buffer = mongo_client.snapshot_buffer
+            if buffer.push(doc):
+                logger.debug("[MongoDB] Queued snapshot for %s", session_id)
+            elif buffer.is_running:
+                logger.warning("[MongoDB] Snapshot buffer full, dropped %s", session_id)
+            else:
+                await mongo_client.reducer_snapshots.insert_one(doc)
         except Exception as e:
             logger.error(f"[MongoDB] Persistence failed: {e}")
 
@@ -175,59 +220,112 @@ class ReducerPipeline:
     ):
         """Step 2B: Vector search and cache results (non-blocking background task)."""
         try:
-            # TODO: Implement actual vector search
-            # For now, just log that this would happen
-            logger.debug(f"[Vector] Would search for session {session_id}")
+            intent = semantic_intent(output)
+            cache_key = RedisKeys.vector_cache(
+                hashlib.blake2b(intent.encode(), digest_size=8).hexdigest()
+            )
 
-            # In production:
-            # 1. Generate semantic intent string from reducer output
-            # 2. Check semantic cache
-            # 3. Embed if needed
-            # 4. Query vector DB with constraint filters
-            # 5. Store top-K in Redis
+            # Reducer traits are discrete, so the same intent recurs across
+            # sessions: reuse its top-K and skip embedding + search entirely
+            module_ids = await redis_client.get_json(cache_key)
+            writes = []
+            if module_ids is None:
+                from app.vector.profile_vectors import user_profile_to_vector_async
+                from app.vector.vector_store import vector_store
+
+                query = await user_profile_to_vector_async(intent)
+                if not query.any():
+                    # No embedding available (e.g. no API key): nothing to rank
+                    return
+                results = vector_store.search(query, top_k=VECTOR_TOP_K)
+                module_ids = [r.id for r in results]
+                writes.append((cache_key, dumps_str(module_ids), TTL.VECTOR_CACHE))
+                logger.debug("[Vector] Cache miss for session %s", session_id)
+            else:
+                logger.debug("[Vector] Cache hit for session %s", session_id)
+
+            writes.append(
+                (
+                    RedisKeys.candidates(session_id),
+                    dumps_str(module_ids),
+                    TTL.CANDIDATES,
+                )
+            )
+            await redis_client.set_many(writes)
 
         except Exception as e:
             logger.error(f"[Vector] Search failed: {e}")
 
-    async def _get_recently_used(self, session_id: str) -> Set[str]:
-        """Get set of recently used component IDs."""
+    async def _update_recently_used(self, session_id: str, new_ids: list) -> None:
+        """
+        Push new selections onto the recently used list.
+
+        Errors are logged rather than raised so a failed history write never
+        fails the layout. Sessions written before the list format still hold
+        a JSON string under this key; that legacy value is replaced.
+        """
+        key = RedisKeys.recently_used(session_id)
         try:
-            data = await redis_client.get(RedisKeys.recently_used(session_id))
-            if data:
-                return set(json.loads(data))
-        except Exception:
-            pass
-        return set()
+            try:
+                await redis_client.push_capped(
+                    key, new_ids, RECENTLY_USED_LIMIT, TTL.RECENTLY_USED
+                )
+            except ResponseError as e:
+                if not str(e).startswith("WRONGTYPE"):
+                    raise
+                await redis_client.delete(key)
+                await redis_client.push_capped(
+                    key, new_ids, RECENTLY_USED_LIMIT, TTL.RECENTLY_USED
+                )
+        except Exception as e:
+            logger.error(f"[Redis] Failed to update recently_used: {e}")
 
-    async def _update_recently_used(self, session_id: str, selection):
-        """Update recently used set with new selections."""
+    async def _read_selection_state(
+        self, session_id: str
+    ) -> Tuple[Set[str], Optional[str]]:
+        """Get the recently used component IDs and previous layout hash."""
         try:
-            current = await self._get_recently_used(session_id)
-            for comp in selection.selected_components:
-                current.add(comp.component_id)
-
-            # Keep only last 20 components
-            if len(current) > 20:
-                current = set(list(current)[-20:])
-
-            await redis_client.set(
-                RedisKeys.recently_used(session_id),
-                json.dumps(list(current)),
-                ttl=TTL.RECENTLY_USED,
+            recently_used, previous_hash = await asyncio.gather(
+                redis_client.lrange(RedisKeys.recently_used(session_id)),
+                redis_client.hget(
+                    RedisKeys.session(session_id), SessionField.LAYOUT_HASH
+                ),
             )
         except Exception as e:
-            logger.error(f"[Redis] Failed to update recently_used: {e}")
+            logger.error(f"[Redis] Failed to read selection state: {e}")
+            return set(), None
+        return set(recently_used), previous_hash
 
-    async def get_cached_layout(self, session_id: str) -> Optional[LayoutSchema]:
-        """Get cached layout from Redis if available."""
+    async def get_cached_layout_raw(self, session_id: str) -> Optional[bytes]:
+        """
+        Get the cached layout as JSON bytes, for handlers that can send it
+        on as-is without a model round trip.
+        """
         try:
-            data = await redis_client.get(RedisKeys.layout(session_id))
+            data = await redis_client.hget_bytes(
+                RedisKeys.session(session_id), SessionField.LAYOUT
+            )
             if data:
-                return LayoutSchema.model_validate_json(data)
+                return unpack(data)
         except Exception:
             pass
         return None
 
+    async def get_cached_layout(self, session_id: str) -> Optional[LayoutSchema]:
+        """
+        Get cached layout from Redis if available.
+
+        The cache only holds layouts this pipeline wrote, so the schema is
+        rebuilt without re-validating it.
+        """
+        data = await self.get_cached_layout_raw(session_id)
+        if data is None:
+            return None
+        try:
+            return LayoutSchema.from_trusted_json(data)
+        except Exception:
+            return None
+
 
 # Singleton instance
 reducer_pipeline = ReducerPipeline()
@@ -0,0 +1,90 @@
+"""
+Telemetry Worker Pool
+Bounded pool of asyncio consumers for background telemetry processing.
+Replaces unbounded BackgroundTasks so bursts queue up instead of flooding
+the event loop and the MongoDB connection pool.
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, List
+
+logger = logging.getLogger(__name__)
+
+
+class TelemetryWorkerPool:
+    """
+    Fixed number of consumer tasks draining a bounded queue.
+
+    The handler is injected so the pool does not import the API layer.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[Any], Awaitable[None]],
+        workers: int = 8,
+        max_queue: int = 256,
+    ):
+        self.handler = handler
+        self.workers = workers
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self._tasks: List[asyncio.Task] = []
+        # Items rejected by submit_nowait because the queue was full
+        self.dropped = 0
+
+    @property
+    def is_running(self) -> bool:
+        return bool(self._tasks)
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def start(self) -> None:
+        """Spawn the consumer tasks (idempotent)."""
+        if self._tasks:
+            return
+        self._tasks = [
+            asyncio.create_task(self._consume(i)) for i in range(self.workers)
+        ]
+        logger.info(f"Telemetry worker pool started ({self.workers} workers)")
+
+    async def stop(self, drain_timeout: float = 5.0) -> None:
+        """Give queued batches a chance to finish, then cancel the consumers."""
+        if not self._tasks:
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout=drain_timeout)
+        except asyncio.TimeoutError:
+            logger.warning(
+                f"Telemetry worker pool stopped with {self.pending} batches pending"
+            )
+
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def submit_nowait(self, item: Any) -> bool:
+        """
+        Queue an item for processing without blocking.
+
+        Returns:
+            False if the queue is full (caller should apply back-pressure)
+        """
+        try:
+            self._queue.put_nowait(item)
+            return True
+        except asyncio.QueueFull:
+            self.dropped += 1
+            return False
+
+    async def _consume(self, worker_id: int) -> None:
+        while True:
+            item = await self._queue.get()
+            try:
+                await self.handler(item)
+            except Exception as e:
+                logger.error(f"Telemetry worker {worker_id} failed: {e}")
+            finally:
+                self._queue.task_done()
@@ -3,7 +3,8 @@ Caching service abstraction
 """
 
 from typing import Optional, Any
-import json
+
+from app.encoding import dumps_str, loads
 
 
 class CacheService:
@@ -17,13 +18,13 @@ class CacheService:
         if not self.redis:
             return None
         value = await self.redis.get(key)
-        return json.loads(value) if value else None
+        return loads(value) if value else None
 
     async def set(self, key: str, value: Any, ttl: int = 300):
         """Set value in cache with TTL"""
         if not self.redis:
             return
-        await self.redis.setex(key, ttl, json.dumps(value))
+        await self.redis.setex(key, ttl, dumps_str(value))
 
     async def delete(self, key: str):
         """Delete key from cache"""
@@ -2,31 +2,51 @@
 Event processing service
 """
 
-from typing import List
+import asyncio
+from typing import Dict, List
 from app.models.events import EventBatch, TelemetryEvent
 
 
 class EventService:
     """Service for processing telemetry events"""
 
+    def __init__(self):
+        # Event type -> handler; add a type by registering it here.
+        # process_batch keeps batch order within a type but runs types
+        # concurrently, so handlers of different types must not depend on
+        # each other's writes to session state.
+        self._handlers = {
+            "mouse": self._process_mouse_event,
+            "touch": self._process_touch_event,
+            "scroll": self._process_scroll_event,
+            "interaction": self._process_interaction_event,
+        }
+
     async def process_batch(self, batch: EventBatch):
         """Process a batch of telemetry events"""
         # TODO: Push to Kafka/RedPanda
         # TODO: Update Redis session state
 
+        # One lane per event type: events of a type are handled in batch
+        # order, and the lanes run concurrently
+        lanes: Dict[str, List[TelemetryEvent]] = {}
         for event in batch.events:
-            await self._process_event(batch.session_id, event)
+            if event.type in self._handlers:
+                lanes.setdefault(event.type, []).append(event)
+        await asyncio.gather(
+            *(self._process_lane(batch.session_id, events) for events in lanes.values())
+        )
+
+    async def _process_lane(self, session_id: str, events: List[TelemetryEvent]):
+        """Process events of a single type sequentially, in batch order"""
+        for event in events:
+            await self._process_event(session_id, event)
 
     async def _process_event(self, session_id: str, event: TelemetryEvent):
-        """Process individual telemetry event"""
-        if event.type == "mouse":
-            await self._process_mouse_event(session_id, event.data)
-        elif event.type == "touch":
-            await self._process_touch_event(session_id, event.data)
-        elif event.type == "scroll":
-            await self._process_scroll_event(session_id, event.data)
-        elif event.type == "interaction":
-            await self._process_interaction_event(session_id, event.data)
+        """Process individual telemetry event (unknown types are ignored)"""
+        handler = self._handlers.get(event.type)
+        if handler is not None:
+            await handler(session_id, event.data)
 
     async def _process_mouse_event(self, session_id: str, data: dict):
         """Process mouse telemetry"""
@@ -1,28 +1,47 @@
-import json
 import os
-from typing import List
+from typing import Dict, List, Tuple
+from app.encoding import loads
 from app.models.product import Product
 
+# Parsed product files kept in memory (the base catalog plus recent sessions)
+MAX_CACHED_FILES = 128
+
 
 class ProductService:
     def __init__(self, products_file: str = "500_products.json"):
         self.products_file = products_file
+        # path -> (mtime_ns, parsed products); re-read only when the file changes
+        self._cache: Dict[str, Tuple[int, List[dict]]] = {}
 
     def get_products_for_session(self, session_id: str) -> List[dict]:
         """Get products for a specific session. Currently returns all products,
         but can be extended to filter based on user preferences.
 
+        The returned list is shared with the cache and must not be mutated.
+
         # TODO: Fetch persisted preferences for session_id from DB
         # TODO: Filter or re-rank products based on those preferences
         """
         session_file = f"session_{session_id}_products.json"
         target_file = session_file if os.path.exists(session_file) else self.products_file
-        
-        if not os.path.exists(target_file):
+
+        try:
+            mtime_ns = os.stat(target_file).st_mtime_ns
+        except FileNotFoundError:
             return []
 
-        with open(target_file, "r", encoding="utf-8") as f:
-            return json.load(f)
+        cached = self._cache.get(target_file)
+        if cached is not None and cached[0] == mtime_ns:
+            return cached[1]
+
+        with open(target_file, "rb") as f:
+            products = loads(f.read())
+
+        if target_file not in self._cache and len(self._cache) >= MAX_CACHED_FILES:
+            # Dicts keep insertion order: drop the oldest entry
+            del self._cache[next(iter(self._cache))]
+        self._cache[target_file] = (mtime_ns, products)
+        return products
 
 
 product_service = ProductService()
@@ -1,8 +1,15 @@
-import requests
-import json
-import re
+import asyncio
 import html
-from urllib.parse import urlparse
+import re
+
+import httpx
+import orjson
+
+_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+}
+# Runs of tags and whitespace collapse to one space in a single pass
+_TAG_OR_SPACE_RE = re.compile(r"(?:<[^>]+>|\s)+")
 
 
 class Shopify500Scraper:
@@ -12,21 +19,13 @@ class Shopify500Scraper:
         """
         self.targets = target_stores[:5]
         self.output_file = output_file
-        self.session = requests.Session()
-        self.session.headers.update(
-            {
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-            }
-        )
         self.master_list = []
 
     def _clean_text(self, raw_html):
         """Strips HTML tags for clean text."""
         if not raw_html:
             return ""
-        text = html.unescape(raw_html)
-        text = re.sub(r"<[^>]+>", " ", text)
-        return " ".join(text.split())
+        return _TAG_OR_SPACE_RE.sub(" ", html.unescape(raw_html)).strip()
 
     def normalize(self, p, domain):
         """Format the data into the strict JSON schema."""
@@ -51,20 +50,20 @@ class Shopify500Scraper:
             "description": self._clean_text(p.get("body_html")),
         }
 
-    def fetch_store_products(self, domain):
+    async def fetch_store_products(self, client, domain):
         """Fetches EXACTLY 100 products from a store."""
         # limit=100 ensures we get exactly 100 items in one shot
         url = f"https://{domain}/products.json?limit=100"
 
         try:
             print(f"--> Fetching 100 items from: {domain}...")
-            r = self.session.get(url, timeout=10)
+            r = await client.get(url)
 
             if r.status_code != 200:
                 print(f"    [Error] Status {r.status_code}")
                 return []
 
-            data = r.json()
+            data = orjson.loads(r.content)
             raw_products = data.get("products", [])
 
             # Strict slice to ensure exactly 100 (in case store returns more)
@@ -74,26 +73,36 @@ class Shopify500Scraper:
             print(f"    [Exception] {e}")
             return []
 
-    def run(self):
+    async def run_async(self):
         print(f"--- Starting 5x100 Scrape ---")
 
-        for domain in self.targets:
-            # 1. Fetch raw data
-            products = self.fetch_store_products(domain)
+        # 1. Fetch raw data from every store concurrently
+        async with httpx.AsyncClient(headers=_HEADERS, timeout=10) as client:
+            results = await asyncio.gather(
+                *(self.fetch_store_products(client, domain) for domain in self.targets)
+            )
 
-            # 2. Normalize and append
+        # 2. Normalize and append (in target order)
+        for domain, products in zip(self.targets, results):
             for p in products:
                 clean_item = self.normalize(p, domain)
                 self.master_list.append(clean_item)
 
-            print(f"    [Success] Added {len(products)} products.")
+            print(f"    [Success] Added {len(products)} products from {domain}.")
 
         # 3. Save to file
-        with open(self.output_file, "w", encoding="utf-8") as f:
-            json.dump(self.master_list, f, indent=2, ensure_ascii=False)
+        await asyncio.to_thread(self._save)
 
         print(f"\n[DONE] Saved {len(self.master_list)} products to {self.output_file}")
 
+    def run(self):
+        """Blocking entry point for scripts."""
+        asyncio.run(self.run_async())
+
+    def _save(self):
+        with open(self.output_file, "wb") as f:
+            f.write(orjson.dumps(self.master_list, option=orjson.OPT_INDENT_2))
+
 
 # --- EXECUTION ---
 if __name__ == "__main__":
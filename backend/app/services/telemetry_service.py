@@ -1,21 +0,0 @@
-import logging
-from app.models.telemetry import MotorTelemetry, TelemetryEventsBatch
-
-logger = logging.getLogger(__name__)
-
-
-class TelemetryService:
-    async def process_motor_telemetry(self, data: MotorTelemetry):
-        # In a real app, this would save to a DB or stream to a processing engine
-        # For now, we'll just log it
-        # TODO: Update persistent behavioral score for the user associated with data.session_id
-        logger.info(f"Received motor telemetry for session {data.session_id}")
-        return {"status": "success", "session_id": data.session_id}
-
-    async def process_events_telemetry(self, data: TelemetryEventsBatch):
-        # TODO: Store specific event preferences (e.g., liked categories) in persistent DB
-        logger.info(f"Received {len(data.events)} events for session {data.session_id}")
-        return {"status": "success", "session_id": data.session_id}
-
-
-telemetry_service = TelemetryService()
@@ -3,47 +3,110 @@ Server-Sent Events publisher
 """
 
 from sse_starlette.sse import EventSourceResponse
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Dict, Set
 import asyncio
-import json
+
+from app.encoding import dumps_str
+
+
+# Per-subscriber backlog; layout frames are snapshots, so the oldest can go
+SUBSCRIBER_QUEUE_SIZE = 64
 
 
 class SSEPublisher:
     """Manages SSE connections for layout updates"""
 
-    def __init__(self):
-        self.subscribers: dict = {}
+    def __init__(self, flush_interval: float = 0.02):
+        # Session -> subscriber queues; a set so disconnects are O(1)
+        self.subscribers: Dict[str, Set[asyncio.Queue]] = {}
+        # Frames dropped because a slow subscriber's queue was full
+        self.dropped_events = 0
+        # Coalescing buffer for enqueue(): latest update per session,
+        # fanned out once per flush_interval tick
+        self.flush_interval = flush_interval
+        self._pending: dict = {}
+        self._wakeup = asyncio.Event()
+        self._flush_task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        """Start the background flush task for enqueue()."""
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_loop())
+
+    async def stop(self) -> None:
+        """Stop the flush task and deliver anything still pending."""
+        if self._flush_task is None:
+            return
+        self._flush_task.cancel()
+        try:
+            await self._flush_task
+        except asyncio.CancelledError:
+            pass
+        self._flush_task = None
+        self._flush_pending()
+
+    def enqueue(self, session_id: str, layout_update: dict) -> None:
+        """
+        Queue a layout update for the next tick (non-blocking).
+
+        Updates for the same session within a tick collapse to the latest
+        one, and each is encoded once regardless of subscriber count.
+        Without a running flush task the update is delivered immediately.
+        """
+        if self._flush_task is None:
+            self._fanout(session_id, layout_update)
+            return
+        self._pending[session_id] = layout_update
+        self._wakeup.set()
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await self._wakeup.wait()
+            await asyncio.sleep(self.flush_interval)  # Let the tick fill up
+            self._wakeup.clear()
+            self._flush_pending()
+
+    def _flush_pending(self) -> None:
+        pending, self._pending = self._pending, {}
+        for session_id, layout_update in pending.items():
+            self._fanout(session_id, layout_update)
+
+    def _fanout(self, session_id: str, layout_update: dict) -> None:
+        queues = self.subscribers.get(session_id)
+        if not queues:
+            return
+        frame = {"event": "layout:update", "data": dumps_str(layout_update)}
+        for queue in queues:
+            self._offer(queue, frame)
+
+    def _offer(self, queue: asyncio.Queue, frame: dict) -> None:
+        """Enqueue a frame, dropping the oldest one if the subscriber is behind."""
+        if queue.full():
+            queue.get_nowait()
+            self.dropped_events += 1
+        queue.put_nowait(frame)
 
     async def subscribe(self, session_id: str) -> AsyncGenerator:
         """Subscribe to layout updates for a session"""
-        queue = asyncio.Queue()
+        queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
 
-        if session_id not in self.subscribers:
-            self.subscribers[session_id] = []
-        self.subscribers[session_id].append(queue)
+        self.subscribers.setdefault(session_id, set()).add(queue)
 
         try:
             while True:
-                data = await queue.get()
-                yield {
-                    "event": data["event"],
-                    "data": json.dumps(data["payload"]),
-                }
+                # Frames are encoded by the publisher and forwarded as-is
+                yield await queue.get()
         finally:
-            self.subscribers[session_id].remove(queue)
+            self.subscribers[session_id].discard(queue)
             if not self.subscribers[session_id]:
                 del self.subscribers[session_id]
 
     async def publish_layout_update(self, session_id: str, layout_update: dict):
-        """Publish layout update to subscribers of a specific session only."""
-        if session_id in self.subscribers:
-            for queue in self.subscribers[session_id]:
-                await queue.put(
-                    {
-                        "event": "layout:update",
-                        "payload": layout_update,
-                    }
-                )
+        """
+        Publish layout update to subscribers of a specific session only.
+        The payload is encoded once and shared by every subscriber.
+        """
+        self._fanout(session_id, layout_update)
 
 
 # Global SSE publisher instance
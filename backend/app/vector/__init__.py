@@ -8,12 +8,14 @@ to UI modules using semantic text embeddings.
 from app.vector.feature_schema import (
     FEATURE_DIMENSIONS,
     FeatureVector,
+    normalize_rows,
     normalize_vector,
 )
 
 from app.vector.module_vectors import (
     ModuleMetadata,
     MODULE_CATALOG,
+    MODULE_MATRIX,
     module_to_vector,
     get_module_by_id,
     get_modules_by_type,
@@ -38,10 +40,12 @@ __all__ = [
     # Schema
     "FEATURE_DIMENSIONS",
     "FeatureVector",
+    "normalize_rows",
     "normalize_vector",
     # Modules
     "ModuleMetadata",
     "MODULE_CATALOG",
+    "MODULE_MATRIX",
     "module_to_vector",
     "get_module_by_id",
     "get_modules_by_type",
@@ -5,19 +5,30 @@ Defines the text embedding feature space used to represent both
 modules and user profiles for similarity matching.
 """
 
-from typing import List
+from typing import Sequence
 import numpy as np
 
 # Number of dimensions for OpenRouter text-embedding-3-small
 FEATURE_DIMENSIONS = 1536
 
-# Type alias for feature vectors
-FeatureVector = List[float]
+# Type alias for feature vectors: contiguous float32 arrays end-to-end
+FeatureVector = np.ndarray
 
-def normalize_vector(vector: FeatureVector) -> FeatureVector:
-    """Normalize vector to unit length for cosine similarity"""
-    arr = np.array(vector)
-    norm = np.linalg.norm(arr)
-    if norm > 0:
-        return (arr / norm).tolist()
-    return vector
+def normalize_vector(vector: Sequence[float]) -> FeatureVector:
+    """
+    Normalize vector to unit length for cosine similarity.
+
+    Returns a float32 array (the store's dtype) rather than a list, so
+    callers passing it on to vector search skip a list round-trip.
+    """
+    arr = np.asarray(vector, dtype=np.float32)
+    # A BLAS dot skips np.linalg.norm's generic dispatch for the 1-D case
+    return arr / (np.sqrt(arr @ arr) or 1.0)
+
+
+def normalize_rows(vectors: Sequence[Sequence[float]]) -> np.ndarray:
+    """Normalize every row of an (N, D) batch to unit length in one pass."""
+    matrix = np.asarray(vectors, dtype=np.float32)
+    norms = np.sqrt(np.einsum("ij,ij->i", matrix, matrix))[:, None]
+    norms[norms == 0] = 1.0
+    return matrix / norms
@@ -9,11 +9,15 @@ Module ID System (24 Modules):
 - This gives us 6 genres * 4 bento types = 24 unique modules
 """
 
-from typing import Dict, List, Optional
-from pydantic import BaseModel, Field
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional
+from pydantic import BaseModel
 import os
 import logging
 import asyncio
+
+import numpy as np
+
 from app.vector.feature_schema import FEATURE_DIMENSIONS
 
 logger = logging.getLogger(__name__)
@@ -52,28 +56,42 @@ def encode_module_id(genre: str, layout: str) -> int:
     return (g_idx * MODULES_PER_GENRE) + l_idx
 
 
-def decode_module_id(module_id: int) -> dict:
-    """Decode module ID to genre and layout"""
+def _decode_module_id(module_id: int) -> Mapping[str, str]:
     genre_idx = module_id // MODULES_PER_GENRE
     layout_idx = module_id % MODULES_PER_GENRE
 
-    return {
-        "genre": GENRE_NAMES.get(genre_idx, "glassmorphism"),
-        "layout": LAYOUT_NAMES.get(layout_idx, "hero"),
-    }
+    return MappingProxyType(
+        {
+            "genre": GENRE_NAMES.get(genre_idx, "glassmorphism"),
+            "layout": LAYOUT_NAMES.get(layout_idx, "hero"),
+        }
+    )
+
+
+# Every valid ID decoded once; entries are read-only and shared by callers
+_DECODED_MODULE_IDS = tuple(
+    _decode_module_id(i) for i in range(len(GENRE_MAP) * MODULES_PER_GENRE)
+)
+
+
+def decode_module_id(module_id: int) -> Mapping[str, str]:
+    """Decode module ID to genre and layout"""
+    if 0 <= module_id < len(_DECODED_MODULE_IDS):
+        return _DECODED_MODULE_IDS[module_id]
+    return _decode_module_id(module_id)
 
 
 class ModuleMetadata(BaseModel):
-    """Module metadata with text embedding feature vector"""
+    """
+    Module metadata. The module's text embedding lives in its row of
+    MODULE_MATRIX (see module_to_vector).
+    """
     module_id: int
     layout: str
     genre: str
     description: str
     tags: List[str]
 
-    # Feature vector (1536 dimensions for text-embedding-3-small)
-    feature_vector: List[float] = Field(default_factory=lambda: [0.0] * FEATURE_DIMENSIONS)
-
 
 def module_to_text(module: ModuleMetadata) -> str:
     """
@@ -161,6 +179,40 @@ def generate_catalog() -> List[ModuleMetadata]:
 # The Complete 24-Module Catalog
 MODULE_CATALOG: List[ModuleMetadata] = generate_catalog()
 
+# The catalog is static, so lookups are indexed once at import. The
+# indexes hold the same objects, so embeddings assigned later show up here.
+_MODULES_BY_ID: Dict[int, ModuleMetadata] = {m.module_id: m for m in MODULE_CATALOG}
+_MODULES_BY_LAYOUT: Dict[str, List[ModuleMetadata]] = {}
+for _module in MODULE_CATALOG:
+    _MODULES_BY_LAYOUT.setdefault(_module.layout, []).append(_module)
+
+# Every module's embedding as one contiguous (N, FEATURE_DIMENSIONS) float32
+# matrix, in catalog order. Zero until initialize_module_vectors_async fills it.
+MODULE_MATRIX = np.zeros((len(MODULE_CATALOG), FEATURE_DIMENSIONS), dtype=np.float32)
+_ROW_BY_ID: Dict[int, int] = {m.module_id: i for i, m in enumerate(MODULE_CATALOG)}
+
+_TYPE_TO_LAYOUT = {
+    "hero": "hero",
+    "wide": "wide",
+    "tall": "tall",
+    "small": "small",
+    "featured": "hero",
+    "product-grid": "small",
+    "cta": "wide",
+}
+
+
+def _embed_catalog(api_key: str) -> List[List[float]]:
+    """Blocking: import the client, build it and embed every module description."""
+    from langchain_openai import OpenAIEmbeddings
+
+    embeddings_model = OpenAIEmbeddings(
+        model="openai/text-embedding-3-small",
+        api_key=api_key,
+        base_url="https://openrouter.ai/api/v1",
+    )
+    return embeddings_model.embed_documents([m.description for m in MODULE_CATALOG])
+
 
 async def initialize_module_vectors_async():
     """Compute and store text embeddings for all modules dynamically using Gemini"""
@@ -171,25 +223,16 @@ async def initialize_module_vectors_async():
         return
 
     try:
-        from langchain_openai import OpenAIEmbeddings
-        embeddings_model = OpenAIEmbeddings(
-            model="openai/text-embedding-3-small",
-            api_key=settings.OPENROUTER_API_KEY,
-            base_url="https://openrouter.ai/api/v1",
-        )
-        
         logger.info(f"[ModuleVectors] Generating embeddings for {len(MODULE_CATALOG)} modules via OpenRouter...")
         
-        texts = [m.description for m in MODULE_CATALOG]
-        
-        # Run in executor to avoid event loop blocking
-        loop = asyncio.get_event_loop()
-        embeddings = await loop.run_in_executor(
-            None, lambda: embeddings_model.embed_documents(texts)
+        # The langchain import, client construction and HTTP call are all
+        # synchronous, so run them together in a worker thread
+        embeddings = await asyncio.to_thread(
+            _embed_catalog, settings.OPENROUTER_API_KEY
         )
         
-        for i, module in enumerate(MODULE_CATALOG):
-            module.feature_vector = embeddings[i]
+        # One vectorized copy into the shared matrix
+        MODULE_MATRIX[:] = np.asarray(embeddings, dtype=np.float32)
             
         logger.info("[ModuleVectors] Successfully generated semantic embeddings for all modules.")
             
@@ -198,25 +241,14 @@ async def initialize_module_vectors_async():
 
 def get_module_by_id(module_id: int) -> Optional[ModuleMetadata]:
     """Get module metadata by ID"""
-    for module in MODULE_CATALOG:
-        if module.module_id == module_id:
-            return module
-    return None
+    return _MODULES_BY_ID.get(module_id)
 
 def get_modules_by_type(module_type: str) -> List[ModuleMetadata]:
     """Get modules by layout type (bento type)."""
-    type_mapping = {
-        "hero": "hero",
-        "wide": "wide",
-        "tall": "tall",
-        "small": "small",
-        "featured": "hero",
-        "product-grid": "small",
-        "cta": "wide",
-    }
-    layout = type_mapping.get(module_type.lower(), module_type.lower())
-    return [m for m in MODULE_CATALOG if m.layout == layout]
-
-def module_to_vector(metadata: ModuleMetadata) -> List[float]:
-    """Return the generated embedding from module metadata"""
-    return metadata.feature_vector
+    module_type = module_type.lower()
+    layout = _TYPE_TO_LAYOUT.get(module_type, module_type)
+    return list(_MODULES_BY_LAYOUT.get(layout, ()))
+
+def module_to_vector(metadata: ModuleMetadata) -> np.ndarray:
+    """Return the module's embedding (a row view into MODULE_MATRIX)"""
+    return MODULE_MATRIX[_ROW_BY_ID[metadata.module_id]]
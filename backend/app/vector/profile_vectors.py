@@ -6,10 +6,14 @@ Implements 80/20 Exploitation/Exploration for automated A/B testing.
 """
 
 import random
+from functools import lru_cache
 from typing import List, Tuple
 import asyncio
 import logging
 import hashlib
+
+import numpy as np
+
 from app.vector.feature_schema import FEATURE_DIMENSIONS, FeatureVector, normalize_vector
 from app.services.cache_service import cache_service
 
@@ -19,6 +23,18 @@ logger = logging.getLogger(__name__)
 EXPLORE_RATE = 0.20
 
 
+@lru_cache(maxsize=4)
+def _embeddings_model(api_key: str):
+    """Embeddings client, imported and built once per API key."""
+    from langchain_openai import OpenAIEmbeddings
+
+    return OpenAIEmbeddings(
+        model="openai/text-embedding-3-small",
+        api_key=api_key,
+        base_url="https://openrouter.ai/api/v1",
+    )
+
+
 async def user_profile_to_vector_async(profile_dict: dict) -> FeatureVector:
     """
     Convert a UserProfile dict directly to a text embedding.
@@ -36,25 +52,16 @@ async def user_profile_to_vector_async(profile_dict: dict) -> FeatureVector:
     cache_key = f"profile_embed:{summary_hash}"
     cached_vec = await cache_service.get(cache_key)
 
-    if cached_vec and len(cached_vec) == FEATURE_DIMENSIONS:
-        return cached_vec
+    if cached_vec is not None and len(cached_vec) == FEATURE_DIMENSIONS:
+        return np.asarray(cached_vec, dtype=np.float32)
 
     if not settings.OPENROUTER_API_KEY:
         logger.warning("No OPENROUTER_API_KEY. Using zero vector for profile.")
-        return [0.0] * FEATURE_DIMENSIONS
+        return np.zeros(FEATURE_DIMENSIONS, dtype=np.float32)
 
     try:
-        from langchain_openai import OpenAIEmbeddings
-        embeddings_model = OpenAIEmbeddings(
-            model="openai/text-embedding-3-small",
-            api_key=settings.OPENROUTER_API_KEY,
-            base_url="https://openrouter.ai/api/v1",
-        )
-
-        loop = asyncio.get_event_loop()
-        embedding = await loop.run_in_executor(
-            None, lambda: embeddings_model.embed_query(summary)
-        )
+        embeddings_model = _embeddings_model(settings.OPENROUTER_API_KEY)
+        embedding = await asyncio.to_thread(embeddings_model.embed_query, summary)
 
         normalized_vec = normalize_vector(embedding)
 
@@ -64,7 +71,7 @@ async def user_profile_to_vector_async(profile_dict: dict) -> FeatureVector:
         return normalized_vec
     except Exception as e:
         logger.error(f"Failed to embed user profile: {e}")
-        return [0.0] * FEATURE_DIMENSIONS
+        return np.zeros(FEATURE_DIMENSIONS, dtype=np.float32)
 
 
 async def get_recommended_template_id_async(profile_dict: dict) -> Tuple[int, bool]:
@@ -5,19 +5,26 @@ Provides fast nearest-neighbor search for module matching using
 text embeddings.
 """
 
+import asyncio
+import time
+
 import numpy as np
-from typing import List, Tuple, Optional, Dict
+from typing import Dict, List, Optional, Sequence
 from dataclasses import dataclass
-from app.vector.feature_schema import FeatureVector
+from app.vector.feature_schema import (
+    FeatureVector,
+    normalize_rows,
+    normalize_vector,
+)
 
 
-@dataclass
+@dataclass(slots=True)
 class SearchResult:
     """Result from vector similarity search"""
 
     id: str
     score: float  # Cosine similarity (higher = more similar)
-    vector: FeatureVector
+    vector: np.ndarray  # Read-only row view into the store matrix
 
 
 class VectorStore:
@@ -28,22 +35,40 @@ class VectorStore:
     def __init__(self):
         self.vectors: Dict[int, np.ndarray] = {}
         self.metadata: Dict[int, dict] = {}
+        # Contiguous (N, D) matrix of all vectors, rebuilt lazily after
+        # writes; once built, self.vectors holds row views into it
+        self._ids: List[int] = []
+        self._matrix: Optional[np.ndarray] = None
 
     def add(self, id: int, vector: FeatureVector, metadata: dict = None):
         """Add a vector to the store"""
-        arr = np.array(vector, dtype=np.float32)
         # Normalize for cosine similarity
-        norm = np.linalg.norm(arr)
-        if norm > 0:
-            arr = arr / norm
-        self.vectors[id] = arr
+        self.vectors[id] = normalize_vector(vector)
         self.metadata[id] = metadata or {}
+        self._matrix = None
+
+    def add_many(
+        self,
+        ids: Sequence[int],
+        vectors: Sequence[FeatureVector],
+        metadata: Sequence[dict] = None,
+    ):
+        """Add a batch of vectors, normalized together as one (N, D) matrix"""
+        matrix = normalize_rows(vectors)
+        adopt = not self.vectors
+        self.vectors.update(zip(ids, matrix))
+        self.metadata.update(zip(ids, metadata or ({} for _ in ids)))
+        if adopt:
+            # Empty store: the normalized batch already is the search matrix
+            matrix.setflags(write=False)
+            self._ids = list(ids)
+            self._matrix = matrix
+        else:
+            self._matrix = None
 
     def get(self, id: str) -> Optional[FeatureVector]:
-        """Get vector by ID"""
-        if id in self.vectors:
-            return self.vectors[id].tolist()
-        return None
+        """Get vector by ID (a read-only view once the matrix is built)"""
+        return self.vectors.get(id)
 
     def search(
         self, query: FeatureVector, top_k: int = 5, filter_fn: callable = None
@@ -53,23 +78,41 @@ class VectorStore:
             return []
 
         # Normalize query vector
-        query_arr = np.array(query, dtype=np.float32)
-        query_norm = np.linalg.norm(query_arr)
-        if query_norm > 0:
-            query_arr = query_arr / query_norm
+        query_arr = normalize_vector(query)
 
-        results = []
-        for id, vec in self.vectors.items():
-            if filter_fn and not filter_fn(id, self.metadata.get(id, {})):
-                continue
+        matrix = self._ensure_matrix()
 
-            similarity = float(np.dot(query_arr, vec))
-            results.append(SearchResult(id=id, score=similarity, vector=vec.tolist()))
+        # One matrix-vector product scores every stored vector
+        scores = matrix @ query_arr
 
-        # Sort by similarity (descending)
-        results.sort(key=lambda r: r.score, reverse=True)
+        if filter_fn:
+            keep = [
+                filter_fn(id, self.metadata.get(id, {})) for id in self._ids
+            ]
+            scores = np.where(keep, scores, -np.inf)
 
-        return results[:top_k]
+        # Sort by similarity (descending)
+        order = np.argsort(-scores, kind="stable")[:top_k]
+
+        return [
+            SearchResult(
+                id=self._ids[i],
+                score=float(scores[i]),
+                vector=matrix[i],
+            )
+            for i in order
+            if scores[i] != -np.inf
+        ]
+
+    def _ensure_matrix(self) -> np.ndarray:
+        """Stack the vectors into one matrix and re-point rows at it."""
+        if self._matrix is None:
+            self._ids = list(self.vectors.keys())
+            self._matrix = np.stack(list(self.vectors.values()))
+            self._matrix.setflags(write=False)
+            # Drop the per-vector arrays; rows share the matrix buffer
+            self.vectors.update(zip(self._ids, self._matrix))
+        return self._matrix
 
     def __len__(self) -> int:
         return len(self.vectors)
@@ -78,37 +121,56 @@ class VectorStore:
         """Clear all vectors"""
         self.vectors.clear()
         self.metadata.clear()
+        self._ids = []
+        self._matrix = None
 
 
 # Global vector store instance
 vector_store = VectorStore()
 
 
+def _build_vector_store() -> None:
+    """Blocking: normalize and load every module vector into the store."""
+    from app.vector.module_vectors import MODULE_CATALOG, MODULE_MATRIX
+
+    vector_store.clear()
+    if not MODULE_CATALOG:
+        return
+
+    # Normalize the whole catalog matrix at once, off the event loop, so
+    # the first search finds the store matrix ready
+    vector_store.add_many(
+        ids=[module.module_id for module in MODULE_CATALOG],
+        vectors=MODULE_MATRIX,
+        metadata=[
+            {
+                "layout": module.layout,
+                "genre": module.genre,
+                "tags": module.tags,
+            }
+            for module in MODULE_CATALOG
+        ],
+    )
+
+
 async def initialize_vector_store_async():
     """
     Initialize the global vector store with module catalog embeddings.
-    Called on app startup.
+    Called on app startup; the blocking work runs off the event loop.
     """
-    from app.vector.module_vectors import MODULE_CATALOG, module_to_vector, initialize_module_vectors_async
+    from app.vector.module_vectors import initialize_module_vectors_async
+
+    start = time.perf_counter()
 
     # First generate all embeddings
     await initialize_module_vectors_async()
 
-    vector_store.clear()
-
-    for module in MODULE_CATALOG:
-        vector = module_to_vector(module)
-        vector_store.add(
-            id=module.module_id,
-            vector=vector,
-            metadata={
-                "layout": module.layout,
-                "genre": module.genre,
-                "tags": module.tags,
-            },
-        )
+    await asyncio.to_thread(_build_vector_store)
 
-    print(f"[VectorStore] Initialized with {len(vector_store)} modules")
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    print(
+        f"[VectorStore] Initialized with {len(vector_store)} modules in {elapsed_ms:.0f}ms"
+    )
 
 
 def search_similar_modules(
@@ -3,8 +3,12 @@ WebSocket message handlers
 """
 
 from fastapi import WebSocket
+from app.encoding import dumps, loads
 from app.websocket.manager import WebSocketManager
 
+_PONG = dumps({"type": "pong"})
+_PONG_TEXT = _PONG.decode()
+
 
 async def handle_websocket_connection(
     websocket: WebSocket, session_id: str, manager: WebSocketManager
@@ -13,11 +17,22 @@ async def handle_websocket_connection(
     await manager.connect(websocket, session_id)
     try:
         while True:
-            data = await websocket.receive_json()
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+
+            # Binary frames carry JSON bytes that orjson parses directly,
+            # skipping the UTF-8 decode; replies mirror the frame type
+            raw = message.get("bytes")
+            is_binary = raw is not None
+            data = loads(raw if is_binary else message["text"])
             message_type = data.get("type")
 
             if message_type == "ping":
-                await websocket.send_json({"type": "pong"})
+                if is_binary:
+                    await websocket.send_bytes(_PONG)
+                else:
+                    await websocket.send_text(_PONG_TEXT)
             elif message_type == "request_layout":
                 # TODO: Fetch and send current layout
                 pass
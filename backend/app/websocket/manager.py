@@ -4,7 +4,8 @@ WebSocket connection manager
 
 from fastapi import WebSocket
 from typing import Dict, List
-import json
+
+from app.encoding import dumps_str
 
 
 class WebSocketManager:
@@ -30,7 +31,7 @@ class WebSocketManager:
     async def send_layout_update(self, session_id: str, layout: dict):
         """Send layout update to all connections for a session"""
         if session_id in self.active_connections:
-            message = json.dumps({"type": "layout_update", "payload": layout})
+            message = dumps_str({"type": "layout_update", "payload": layout})
             for connection in self.active_connections[session_id]:
                 try:
                     await connection.send_text(message)
@@ -39,7 +40,7 @@ class WebSocketManager:
 
     async def broadcast(self, message: dict):
         """Broadcast message to all connections"""
-        text = json.dumps(message)
+        text = dumps_str(message)
         for connections in self.active_connections.values():
             for connection in connections:
                 try:
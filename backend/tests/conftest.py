@@ -5,6 +5,7 @@ Provides mocked database clients, Redis, and LLM services.
 
 import pytest
 import asyncio
+import json
 from unittest.mock import AsyncMock, MagicMock, patch
 from typing import Dict, Any, List
 import numpy as np
@@ -33,6 +34,9 @@ class MockRedisClient:
     def __init__(self):
         self._data: Dict[str, str] = {}
         self._locks: Dict[str, bool] = {}
+        self._lists: Dict[str, List[str]] = {}
+        self._hashes: Dict[str, Dict[str, Any]] = {}
+        self._ttls: Dict[str, int] = {}
 
     async def get(self, key: str) -> str | None:
         return self._data.get(key)
@@ -43,14 +47,66 @@ class MockRedisClient:
         if nx and key in self._data:
             return False
         self._data[key] = value
+        if ex or ttl:
+            self._ttls[key] = ex or ttl
         return True
 
+    async def mget(self, keys: List[str]) -> List[str | None]:
+        return [self._data.get(key) for key in keys]
+
+    async def set_many(self, items: List[tuple]) -> None:
+        for key, value, ttl in items:
+            self._data[key] = value
+
+    async def hget(self, key: str, field: str) -> str | None:
+        value = self._hashes.get(key, {}).get(field)
+        return value.decode() if isinstance(value, bytes) else value
+
+    async def hget_bytes(self, key: str, field: str) -> bytes | None:
+        value = self._hashes.get(key, {}).get(field)
+        return value.encode() if isinstance(value, str) else value
+
+    async def hset_many(self, key: str, mapping: Dict[str, Any], ttl: int = None):
+        self._hashes.setdefault(key, {}).update(mapping)
+
+    async def lrange(self, key: str, start: int = 0, end: int = -1) -> List[str]:
+        items = self._lists.get(key, [])
+        return items[start:] if end == -1 else items[start : end + 1]
+
+    async def push_capped(
+        self, key: str, values: List[str], maxlen: int, ttl: int = None
+    ) -> None:
+        if values:
+            items = list(reversed(values)) + self._lists.get(key, [])
+            self._lists[key] = items[:maxlen]
+
+    async def get_json(self, key: str):
+        value = self._data.get(key)
+        return json.loads(value) if value else None
+
+    async def set_json(self, key: str, value, ttl: int = None) -> bool:
+        return await self.set(key, json.dumps(value), ttl=ttl)
+
     async def delete(self, key: str) -> int:
         if key in self._data:
             del self._data[key]
             return 1
         return 0
 
+    async def acquire_lock_and_get_state(
+        self, lock_key: str, state_key: str, token: str, ttl: int, field: str = None
+    ) -> tuple[bool, str | None]:
+        acquired = await self.set(lock_key, token, ex=ttl, nx=True)
+        if field is not None:
+            return acquired, await self.hget(state_key, field)
+        return acquired, self._data.get(state_key)
+
+    async def release_lock(self, key: str, token: str) -> bool:
+        if self._data.get(key) == token:
+            del self._data[key]
+            return True
+        return False
+
     async def publish(self, channel: str, message: str):
         pass
 
@@ -66,6 +122,9 @@ class MockRedisClient:
     def clear(self):
         self._data.clear()
         self._locks.clear()
+        self._lists.clear()
+        self._hashes.clear()
+        self._ttls.clear()
 
 
 @pytest.fixture
@@ -115,6 +174,20 @@ class MockCollection:
         pass
 
 
+class MockMotorBuffer:
+    """Mock buffered writer that records pushed documents."""
+
+    def __init__(self):
+        self.docs: List[Dict] = []
+        self.is_running = True
+
+    def push(self, doc: Dict) -> bool:
+        if not self.is_running:
+            return False
+        self.docs.append(doc)
+        return True
+
+
 class MockMongoClient:
     """Mock MongoDB client for testing."""
 
@@ -122,6 +195,8 @@ class MockMongoClient:
         self.db = MagicMock()
         self._connected = False
         self._collections: Dict[str, MockCollection] = {}
+        self.motor_buffer = MockMotorBuffer()
+        self.snapshot_buffer = MockMotorBuffer()
 
     async def connect(self, max_retries=3, retry_delay=1.0):
         self._connected = True
@@ -154,8 +229,12 @@ class MockMongoClient:
         return self._get_collection("layouts")
 
     @property
-    def telemetry(self):
-        return self._get_collection("telemetry")
+    def telemetry_buckets(self):
+        return self._get_collection("telemetry_buckets")
+
+    @property
+    def reducer_snapshots(self):
+        return self._get_collection("reducer_snapshots")
 
 
 @pytest.fixture
@@ -346,6 +425,11 @@ class MockSSEPublisher:
             {"session_id": session_id, "layout_update": layout_update}
         )
 
+    def enqueue(self, session_id: str, layout_update: Dict):
+        self.published_messages.append(
+            {"session_id": session_id, "layout_update": layout_update}
+        )
+
     def subscribe(self, session_id: str):
         async def gen():
             yield {"data": "test"}
@@ -56,6 +56,56 @@ class TestSSEPublisher:
         assert len(session_1_updates) == 1
         assert len(session_2_updates) == 1
 
+    @pytest.mark.asyncio
+    async def test_enqueue_coalesces_per_tick(self):
+        """Updates for a session within one tick should collapse to the latest."""
+        from app.sse.publisher import SSEPublisher
+
+        publisher = SSEPublisher(flush_interval=0.01)
+        queue = asyncio.Queue()
+        publisher.subscribers["session_1"] = {queue}
+
+        publisher.start()
+        publisher.enqueue("session_1", {"suggested_id": 1})
+        publisher.enqueue("session_1", {"suggested_id": 2})
+        await asyncio.sleep(0.05)
+        await publisher.stop()
+
+        assert queue.qsize() == 1
+        frame = queue.get_nowait()
+        assert json.loads(frame["data"]) == {"suggested_id": 2}
+
+    @pytest.mark.asyncio
+    async def test_slow_subscriber_drops_oldest(self):
+        """A full subscriber queue should drop its oldest frame, not grow."""
+        from app.sse.publisher import SSEPublisher
+
+        publisher = SSEPublisher()
+        queue = asyncio.Queue(maxsize=2)
+        publisher.subscribers["session_1"] = {queue}
+
+        for i in range(3):
+            await publisher.publish_layout_update("session_1", {"id": i})
+
+        assert queue.qsize() == 2
+        assert json.loads(queue.get_nowait()["data"]) == {"id": 1}
+        assert publisher.dropped_events == 1
+
+    @pytest.mark.asyncio
+    async def test_fanout_shares_one_frame(self):
+        """Every subscriber should receive the same encoded frame object."""
+        from app.sse.publisher import SSEPublisher
+
+        publisher = SSEPublisher()
+        queues = {asyncio.Queue(), asyncio.Queue()}
+        publisher.subscribers["session_1"] = queues
+
+        await publisher.publish_layout_update("session_1", {"id": 7})
+
+        first, second = (q.get_nowait() for q in queues)
+        assert first is second
+        assert json.loads(first["data"]) == {"id": 7}
+
 
 class TestHealthCheckEndpoint:
     """Tests for /health endpoint."""
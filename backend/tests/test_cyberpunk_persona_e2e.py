@@ -402,7 +402,7 @@ async def test_cyberpunk_persona_e2e():
         dt=float(motor_dt),
         samples=raw_samples
     )
-    processed_motor = transform_motor_samples(motor_payload)
+    processed_motor = transform_motor_samples(motor_payload).to_dicts()
     print(f"Generated {len(raw_samples)} motor samples → {len(processed_motor)} processed datapoints")
 
     # 3. Generate mocked interaction events (frontend TelemetryEvent format)
@@ -2,10 +2,15 @@
 Unit tests for the Post-Reducer DB Pipeline
 """
 
+import hashlib
 import pytest
 import time
 from datetime import datetime
+from unittest.mock import AsyncMock, patch
 
+from redis.exceptions import ResponseError
+
+from app.encoding import COMPRESS_THRESHOLD, dumps, pack, unpack
 from app.models.reducer import (
     ReducerOutput,
     ReducerContext,
@@ -14,11 +19,21 @@ from app.models.reducer import (
     InteractionTraits,
     BehavioralTraits,
 )
-from app.models.constraints import Constraints, HardConstraints, SoftPreferences
+from app.models.constraints import (
+    Constraints,
+    HardConstraints,
+    SelectionResult,
+    SoftPreferences,
+)
 from app.pipeline.constraint_builder import constraint_builder
 from app.pipeline.component_selector import component_selector
 from app.pipeline.layout_assembler import layout_assembler
-from app.pipeline.redis_keys import RedisKeys, TTL
+from app.pipeline.redis_keys import RedisKeys, SessionField, TTL
+from app.pipeline.reducer_pipeline import (
+    RECENTLY_USED_LIMIT,
+    reducer_pipeline,
+    semantic_intent,
+)
 
 
 class TestConstraintBuilder:
@@ -63,6 +78,48 @@ class TestConstraintBuilder:
 
         assert low_constraints.exploration_budget < high_constraints.exploration_budget
 
+    def test_genre_weights_cover_all_trait_combinations(self):
+        """Test every density/engagement pair has normalized genre weights"""
+        context = ReducerContext(session_id="test_004")
+
+        for density in ("low", "medium", "high"):
+            for depth in ("shallow", "moderate", "deep"):
+                output = ReducerOutput(
+                    visual=VisualTraits(density=density),
+                    behavioral=BehavioralTraits(engagement_depth=depth),
+                )
+                weights = constraint_builder.build(output, context).soft.genre_weights
+                assert len(weights) == 6
+                assert sum(weights.values()) == pytest.approx(1.0, abs=0.01)
+
+    def test_build_is_memoized_per_traits(self):
+        """Test repeated traits reuse constraints regardless of session"""
+        output = ReducerOutput(visual=VisualTraits(color_scheme="dark"))
+
+        first = constraint_builder.build(output, ReducerContext(session_id="a"))
+        second = constraint_builder.build(
+            ReducerOutput(visual=VisualTraits(color_scheme="dark")),
+            ReducerContext(session_id="b"),
+        )
+        other = constraint_builder.build(
+            output, ReducerContext(session_id="a", device_type="mobile")
+        )
+
+        assert second is first
+        assert other is not first
+        assert other.hard.device_type == "mobile"
+
+    def test_build_with_json_caches_serialized_constraints(self):
+        """Test the cached JSON matches the constraints it was built from"""
+        output = ReducerOutput(visual=VisualTraits(density="high"))
+        context = ReducerContext(session_id="json_001")
+
+        constraints, first = constraint_builder.build_with_json(output, context)
+        _, second = constraint_builder.build_with_json(output, context)
+
+        assert second is first
+        assert Constraints.model_validate_json(first) == constraints
+
 
 class TestComponentSelector:
     """Tests for component selector"""
@@ -105,6 +162,21 @@ class TestComponentSelector:
             for hero in second_heroes:
                 assert hero.component_id != first_hero.component_id
 
+    def test_seeded_selection_is_replayable(self):
+        """Test the same seed reproduces the same exploration choices"""
+        constraints = Constraints(exploration_budget=0.5)
+
+        def ids(result):
+            return [
+                c.component_id
+                for c in result.selected_components + result.exploration_components
+            ]
+
+        first = component_selector.select(constraints=constraints, seed=42)
+        second = component_selector.select(constraints=constraints, seed=42)
+
+        assert ids(first) == ids(second)
+
 
 class TestLayoutAssembler:
     """Tests for layout assembler"""
@@ -120,7 +192,7 @@ class TestLayoutAssembler:
         )
 
         assert layout.layout_id.startswith("layout_test_layout_001")
-        assert len(layout.layout_hash) == 64  # SHA256 hex
+        assert len(layout.layout_hash) == 64  # 32-byte BLAKE2b hex
         assert len(layout.components) > 0
         assert layout.tokens.theme == "light"
 
@@ -148,9 +220,12 @@ class TestRedisKeys:
         """Test key pattern generation"""
         session_id = "session_abc123"
 
-        assert RedisKeys.state(session_id) == "session:session_abc123:state"
-        assert RedisKeys.constraints(session_id) == "session:session_abc123:constraints"
-        assert RedisKeys.layout(session_id) == "session:session_abc123:layout"
+        assert RedisKeys.session(session_id) == "session:session_abc123"
+        assert RedisKeys.candidates(session_id) == "session:session_abc123:candidates"
+        assert (
+            RedisKeys.recently_used(session_id)
+            == "session:session_abc123:recently_used"
+        )
 
     def test_ttl_values(self):
         """Test TTL constants are reasonable"""
@@ -159,6 +234,212 @@ class TestRedisKeys:
         assert TTL.LAYOUT == 30 * 60  # 30 minutes
 
 
+class TestReducerPipeline:
+    """Tests for the pipeline's Redis round trips"""
+
+    @pytest.mark.asyncio
+    async def test_process_writes_session_keys(self, mock_redis):
+        """Test state, selection and layout fields are written and read back"""
+        payload = ReducerPayload(
+            output=ReducerOutput(), context=ReducerContext(session_id="pipe_001")
+        )
+
+        with patch("app.pipeline.reducer_pipeline.redis_client", mock_redis):
+            layout = await reducer_pipeline.process(payload, skip_persistence=True)
+            recently_used, previous_hash = (
+                await reducer_pipeline._read_selection_state("pipe_001")
+            )
+
+        for field in (
+            SessionField.STATE,
+            SessionField.CONSTRAINTS,
+            SessionField.LAYOUT,
+        ):
+            assert await mock_redis.hget_bytes(RedisKeys.session("pipe_001"), field)
+        assert await mock_redis.get_json(RedisKeys.selected("pipe_001")) is not None
+        assert previous_hash == layout.layout_hash
+        assert {c.id for c in layout.components} >= recently_used
+
+    @pytest.mark.asyncio
+    async def test_selection_expires_with_candidates(self, mock_redis):
+        """Test the selection keeps the short candidates TTL, not the session's"""
+        payload = ReducerPayload(
+            output=ReducerOutput(), context=ReducerContext(session_id="pipe_010")
+        )
+
+        with patch("app.pipeline.reducer_pipeline.redis_client", mock_redis):
+            await reducer_pipeline.process(payload, skip_persistence=True)
+
+        assert mock_redis._ttls[RedisKeys.selected("pipe_010")] == TTL.CANDIDATES
+        assert "selected" not in mock_redis._hashes[RedisKeys.session("pipe_010")]
+
+    @pytest.mark.asyncio
+    async def test_recently_used_keeps_newest(self, mock_redis):
+        """Test the recently used list is trimmed to its newest entries"""
+        key = RedisKeys.recently_used("pipe_004")
+        old_ids = [f"old_{i}" for i in range(RECENTLY_USED_LIMIT)]
+        await mock_redis.push_capped(key, old_ids, RECENTLY_USED_LIMIT)
+        payload = ReducerPayload(
+            output=ReducerOutput(), context=ReducerContext(session_id="pipe_004")
+        )
+
+        with patch("app.pipeline.reducer_pipeline.redis_client", mock_redis):
+            layout = await reducer_pipeline.process(payload, skip_persistence=True)
+
+        recent = await mock_redis.lrange(key)
+        new = [i for i in recent if not i.startswith("old_")]
+        assert len(recent) == RECENTLY_USED_LIMIT
+        assert new and set(new) <= {c.id for c in layout.components}
+        # Newest first: the oldest IDs fall off the tail
+        assert recent[len(new) :] == old_ids[::-1][: RECENTLY_USED_LIMIT - len(new)]
+
+    @pytest.mark.asyncio
+    async def test_recently_used_replaces_legacy_string(self, mock_redis):
+        """Test a pre-list JSON string value is deleted and the push retried"""
+        key = RedisKeys.recently_used("pipe_011")
+        await mock_redis.set(key, '["old"]')
+        push = AsyncMock(
+            side_effect=[ResponseError("WRONGTYPE Operation against a key"), None]
+        )
+        payload = ReducerPayload(
+            output=ReducerOutput(), context=ReducerContext(session_id="pipe_011")
+        )
+
+        mock_redis.push_capped = push
+
+        with patch("app.pipeline.reducer_pipeline.redis_client", mock_redis):
+            layout = await reducer_pipeline.process(payload, skip_persistence=True)
+
+        assert layout.components
+        assert key not in mock_redis._data
+        assert push.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_recently_used_failure_does_not_fail_layout(self, mock_redis):
+        """Test a Redis error on the history write is logged, not raised"""
+        payload = ReducerPayload(
+            output=ReducerOutput(), context=ReducerContext(session_id="pipe_012")
+        )
+
+        mock_redis.push_capped = AsyncMock(side_effect=ConnectionError("down"))
+
+        with patch("app.pipeline.reducer_pipeline.redis_client", mock_redis):
+            layout = await reducer_pipeline.process(payload, skip_persistence=True)
+
+        assert layout.layout_hash
+
+    @pytest.mark.asyncio
+    async def test_recently_used_skips_known_ids(self, mock_redis):
+        """Test IDs already in the recently used list are not pushed again"""
+        payload = ReducerPayload(
+            output=ReducerOutput(), context=ReducerContext(session_id="pipe_006")
+        )
+        constraints = constraint_builder.build(payload.output, payload.context)
+        selected = component_selector.select(
+            constraints=constraints, required_types=["hero", "product-grid", "cta"]
+        ).selected_components
+        key = RedisKeys.recently_used("pipe_006")
+        await mock_redis.push_capped(
+            key, [c.component_id for c in selected], RECENTLY_USED_LIMIT
+        )
+
+        # Re-select the same components even though they were recently used
+        same = SelectionResult(
+            selected_components=selected,
+            exploration_components=[],
+            total_candidates_considered=len(selected),
+            selection_timestamp=0,
+        )
+
+        with patch("app.pipeline.reducer_pipeline.redis_client", mock_redis), patch(
+            "app.pipeline.reducer_pipeline.component_selector.select",
+            return_value=same,
+        ):
+            await reducer_pipeline.process(payload, skip_persistence=True)
+
+        recent = await mock_redis.lrange(key)
+        assert len(recent) == len(set(recent)) == len(selected)
+
+    @pytest.mark.asyncio
+    async def test_cached_layout_round_trips(self, mock_redis):
+        """Test the packed layout reads back as the assembled schema"""
+        payload = ReducerPayload(
+            output=ReducerOutput(), context=ReducerContext(session_id="pipe_005")
+        )
+
+        with patch("app.pipeline.reducer_pipeline.redis_client", mock_redis):
+            layout = await reducer_pipeline.process(payload, skip_persistence=True)
+            cached = await reducer_pipeline.get_cached_layout("pipe_005")
+            raw = await reducer_pipeline.get_cached_layout_raw("pipe_005")
+
+        assert cached == layout
+        assert raw == layout.model_dump_json().encode()
+
+    def test_pack_round_trips(self):
+        """Test small payloads stay raw and large ones survive packing"""
+        small = b'{"a":1}'
+        large = dumps(list(range(COMPRESS_THRESHOLD)))
+
+        assert pack(small) == b"R" + small
+        assert unpack(pack(small)) == small
+        assert unpack(pack(large)) == large
+        assert unpack(small) == small  # Legacy untagged JSON
+
+    @pytest.mark.asyncio
+    async def test_process_buffers_snapshot(self, mock_redis, mock_mongo):
+        """Test the reducer snapshot is queued on the buffered writer"""
+        payload = ReducerPayload(
+            output=ReducerOutput(), context=ReducerContext(session_id="pipe_002")
+        )
+
+        with patch("app.pipeline.reducer_pipeline.redis_client", mock_redis), patch(
+            "app.pipeline.reducer_pipeline.mongo_client", mock_mongo
+        ):
+            await reducer_pipeline.process(payload)
+
+        (doc,) = mock_mongo.snapshot_buffer.docs
+        assert doc["session_id"] == "pipe_002"
+        assert "hard" in doc["constraints_summary"]
+
+    @pytest.mark.asyncio
+    async def test_snapshot_inserted_directly_without_buffer(
+        self, mock_redis, mock_mongo
+    ):
+        """Test snapshots are written directly when the buffer isn't running"""
+        mock_mongo.snapshot_buffer.is_running = False
+        payload = ReducerPayload(
+            output=ReducerOutput(), context=ReducerContext(session_id="pipe_007")
+        )
+
+        with patch("app.pipeline.reducer_pipeline.redis_client", mock_redis), patch(
+            "app.pipeline.reducer_pipeline.mongo_client", mock_mongo
+        ):
+            await reducer_pipeline.process(payload)
+
+        (doc,) = mock_mongo.reducer_snapshots._documents
+        assert doc["session_id"] == "pipe_007"
+        assert not mock_mongo.snapshot_buffer.docs
+
+    @pytest.mark.asyncio
+    async def test_vector_search_reuses_cached_intent(self, mock_redis):
+        """Test a cached intent's top-K is copied without searching"""
+        output = ReducerOutput(visual=VisualTraits(color_scheme="dark"))
+        fingerprint = hashlib.blake2b(
+            semantic_intent(output).encode(), digest_size=8
+        ).hexdigest()
+        await mock_redis.set_json(RedisKeys.vector_cache(fingerprint), [3, 7, 11])
+
+        with patch("app.pipeline.reducer_pipeline.redis_client", mock_redis), patch(
+            "app.vector.vector_store.vector_store.search"
+        ) as search:
+            await reducer_pipeline._vector_search_and_cache(
+                "pipe_003", output, Constraints()
+            )
+
+        search.assert_not_called()
+        assert await mock_redis.get_json(RedisKeys.candidates("pipe_003")) == [3, 7, 11]
+
+
 class TestPipelinePerformance:
     """Performance tests for critical path"""
 
@@ -126,6 +126,13 @@ class TestSemanticCacheWithMockedEmbeddings:
         assert isinstance(embedding, np.ndarray)
         assert len(embedding) == 768  # Default dimension
 
+    @pytest.mark.asyncio
+    async def test_embed_is_unit_normalized(self, mock_cache):
+        """_embed should return unit vectors so similarity is a dot product."""
+        embedding = await mock_cache._embed("test text")
+
+        assert abs(np.linalg.norm(embedding) - 1.0) < 1e-5
+
     @pytest.mark.asyncio
     async def test_embed_deterministic(self, mock_cache):
         """Same text should produce same embedding."""
@@ -165,6 +172,20 @@ class TestSemanticCacheWithMockedEmbeddings:
         assert result is not None
         assert result["suggested_id"] == 5
 
+    @pytest.mark.asyncio
+    async def test_cache_hit_from_redis(self, mock_cache):
+        """Entries stored in Redis should be found via the batched lookup."""
+        mock_cache.threshold = 0.5
+
+        await mock_cache.set("browsing products on mobile device", {"suggested_id": 7})
+        await mock_cache.set("rage clicking the checkout button", {"suggested_id": 9})
+        assert not mock_cache._memory_cache
+
+        result = await mock_cache.get("browsing products on mobile device")
+
+        assert result is not None
+        assert result["suggested_id"] == 7
+
     @pytest.mark.asyncio
     async def test_skip_short_summaries(self, mock_cache):
         """Should skip summaries shorter than 10 characters."""
@@ -20,11 +20,11 @@ class TestMotorSampleTransformation:
     """Tests for transform_motor_samples function."""
 
     def test_empty_motor_data(self):
-        """Should return empty list for no samples."""
+        """Should return empty frames for no samples."""
         from app.api.events import transform_motor_samples
 
         result = transform_motor_samples(None)
-        assert result == []
+        assert len(result) == 0
 
     def test_single_sample(self):
         """Should return empty for single sample (need 2 for velocity)."""
@@ -36,7 +36,25 @@ class TestMotorSampleTransformation:
         )
 
         result = transform_motor_samples(motor)
-        assert result == []
+        assert len(result) == 0
+
+    def test_ragged_samples_are_normalized(self):
+        """Short samples are dropped and extra coordinates trimmed to [x, y]."""
+        from app.api.events import transform_motor_samples
+        from app.models.events import MotorTelemetryPayload
+        from app.models.motor import pack_motor_samples
+
+        motor = MotorTelemetryPayload(
+            session_id="test",
+            device="mouse",
+            t0=1000,
+            dt=16,
+            samples=[[0, 0], [5], [], [10, 0, 0.5], [20, 0]],
+        )
+
+        assert motor.samples == [[0, 0], [10, 0], [20, 0]]
+        assert len(transform_motor_samples(motor)) == 3
+        assert pack_motor_samples(motor.samples)["n"] == 3
 
     def test_velocity_calculation(self):
         """Should correctly calculate velocity from position samples."""
@@ -55,9 +73,9 @@ class TestMotorSampleTransformation:
 
         assert len(result) == 2
         # First sample has zero velocity
-        assert result[0]["velocity"]["x"] == 0
+        assert result.vel[0, 0] == 0
         # Second sample: 10 pixels / 0.1 seconds = 100 px/s
-        assert result[1]["velocity"]["x"] == 100.0
+        assert result.vel[1, 0] == 100.0
 
     def test_acceleration_calculation(self):
         """Should correctly calculate acceleration from velocity changes."""
@@ -80,10 +98,10 @@ class TestMotorSampleTransformation:
 
         assert len(result) == 3
         # Third sample should have acceleration
-        assert result[2]["acceleration"]["x"] == 1000.0
+        assert result.acc[2, 0] == 1000.0
 
     def test_output_structure(self):
-        """Output should have timestamp, position, velocity, acceleration."""
+        """Legacy dict view should have timestamp, position, velocity, acceleration."""
         from app.api.events import transform_motor_samples
         from app.models.events import MotorTelemetryPayload
 
@@ -98,7 +116,7 @@ class TestMotorSampleTransformation:
         result = transform_motor_samples(motor)
 
         assert len(result) == 2
-        for sample in result:
+        for sample in result.to_dicts():
             assert "timestamp" in sample
             assert "position" in sample
             assert "velocity" in sample
@@ -106,6 +124,43 @@ class TestMotorSampleTransformation:
             assert "x" in sample["position"]
             assert "y" in sample["position"]
 
+    def test_pack_motor_samples_roundtrip(self):
+        """Packed float32 blobs should unpack to the original coordinates."""
+        from app.models.motor import pack_motor_samples, unpack_motor_samples
+
+        doc = pack_motor_samples([[100, 200], [105.5, 202], [111, 204.25]])
+
+        assert doc["n"] == 3
+        assert isinstance(doc["xs"], bytes)
+        assert len(doc["xs"]) == 3 * 4
+        assert unpack_motor_samples(doc).tolist() == [
+            [100, 200],
+            [105.5, 202],
+            [111, 204.25],
+        ]
+
+
+class TestEventBatchModel:
+    """Tests for EventBatch parse-time validation."""
+
+    def test_unknown_device_defaults_to_desktop(self, sample_telemetry_batch):
+        """Unrecognized device types should fall back to desktop."""
+        from app.models.events import EventBatch
+
+        payload = {**sample_telemetry_batch, "device_type": "smart_tv"}
+        batch = EventBatch(**payload)
+
+        assert batch.device_type == "desktop"
+
+    def test_known_device_preserved(self, sample_telemetry_batch):
+        """Known device types should pass through unchanged."""
+        from app.models.events import EventBatch
+
+        payload = {**sample_telemetry_batch, "device_type": "tablet"}
+        batch = EventBatch(**payload)
+
+        assert batch.device_type == "tablet"
+
 
 class TestMotorStateClassification:
     """Tests for motor state classification logic."""
@@ -248,7 +303,7 @@ class TestProcessTelemetryBatch:
 
     @pytest.mark.asyncio
     async def test_saves_events_to_mongo(self, mock_all_deps, sample_telemetry_batch):
-        """Should save events to MongoDB telemetry collection."""
+        """Should save events to the MongoDB telemetry_buckets collection."""
         mock_redis, mock_mongo, mock_sse = mock_all_deps
 
         from app.api.events import process_telemetry_batch
@@ -258,8 +313,11 @@ class TestProcessTelemetryBatch:
 
         await process_telemetry_batch(batch)
 
-        # Check MongoDB was called
-        assert len(mock_mongo.telemetry._documents) > 0
+        # One columnar bucket per batch
+        buckets = mock_mongo.telemetry_buckets._documents
+        assert len(buckets) == 1
+        assert buckets[0]["count"] == len(batch.events)
+        assert buckets[0]["target_id"] == [e.target_id for e in batch.events]
 
     @pytest.mark.asyncio
     async def test_acquires_and_releases_lock(
@@ -336,6 +394,138 @@ class TestProcessTelemetryBatch:
             # SSE should NOT be called (skipped due to lock)
             assert len(mock_sse_publisher.published_messages) == 0
 
+    @pytest.mark.asyncio
+    async def test_skips_agent_on_unchanged_signature(
+        self, mock_all_deps, sample_telemetry_batch
+    ):
+        """A repeat of the same batch shape should not re-run the agent."""
+        mock_redis, mock_mongo, mock_sse = mock_all_deps
+
+        from app.api.events import process_telemetry_batch
+        from app.models.events import EventBatch
+
+        batch = EventBatch(**sample_telemetry_batch)
+
+        await process_telemetry_batch(batch)
+        await process_telemetry_batch(batch)
+
+        assert len(mock_sse.published_messages) == 1
+
+    @pytest.mark.asyncio
+    async def test_reruns_agent_on_same_counts_different_events(
+        self, mock_all_deps, sample_telemetry_batch
+    ):
+        """A batch with the same counts but different events should re-run."""
+        mock_redis, mock_mongo, mock_sse = mock_all_deps
+
+        from app.api.events import process_telemetry_batch
+        from app.models.events import EventBatch
+
+        first = EventBatch(**sample_telemetry_batch)
+        changed = dict(sample_telemetry_batch)
+        changed["events"] = [
+            {**event, "type": "scroll", "target_id": f"gallery_{i}"}
+            for i, event in enumerate(sample_telemetry_batch["events"])
+        ]
+        second = EventBatch(**changed)
+        assert len(second.events) == len(first.events)
+
+        await process_telemetry_batch(first)
+        await process_telemetry_batch(second)
+
+        assert len(mock_sse.published_messages) == 2
+
+    @pytest.mark.asyncio
+    async def test_agent_cache_hit_skips_agent(
+        self, mock_redis, mock_mongo, mock_sse_publisher, sample_telemetry_batch
+    ):
+        """A cached result for the same fingerprint should be published as-is."""
+        from app.api.events import agent_cache_fingerprint, process_telemetry_batch
+        from app.models.events import EventBatch
+        from app.pipeline.redis_keys import RedisKeys
+
+        batch = EventBatch(**sample_telemetry_batch)
+        key = RedisKeys.agent_cache(agent_cache_fingerprint({}, 0, 10))
+        await mock_redis.set(
+            key,
+            json.dumps(
+                {
+                    "suggested_id": 7,
+                    "recommended_genre": "minimalist",
+                    "profile_summary": "Cached",
+                }
+            ),
+        )
+        agent = AsyncMock(return_value=None)
+
+        with patch("app.api.events.redis_client", mock_redis), patch(
+            "app.api.events.mongo_client", mock_mongo
+        ), patch("app.api.events.sse_publisher", mock_sse_publisher), patch(
+            "app.api.events.run_layout_generation", agent
+        ), patch(
+            "app.api.events.SEMANTIC_CACHE_AVAILABLE", False
+        ):
+            await process_telemetry_batch(batch)
+
+        agent.assert_not_called()
+        assert (
+            mock_sse_publisher.published_messages[0]["layout_update"]["suggested_id"]
+            == 7
+        )
+
+
+class TestTelemetryWorkerPool:
+    """Tests for the bounded telemetry worker pool."""
+
+    @pytest.mark.asyncio
+    async def test_processes_submitted_items(self):
+        """Submitted items should be handed to the handler."""
+        from app.pipeline.worker import TelemetryWorkerPool
+
+        handled = []
+
+        async def handler(item):
+            handled.append(item)
+
+        pool = TelemetryWorkerPool(handler, workers=2, max_queue=4)
+        pool.start()
+        assert pool.submit_nowait("a") is True
+        assert pool.submit_nowait("b") is True
+        await pool.stop()
+
+        assert sorted(handled) == ["a", "b"]
+        assert pool.is_running is False
+
+    @pytest.mark.asyncio
+    async def test_rejects_when_queue_full(self):
+        """submit_nowait should report back-pressure instead of blocking."""
+        from app.pipeline.worker import TelemetryWorkerPool
+
+        pool = TelemetryWorkerPool(AsyncMock(), workers=1, max_queue=1)
+
+        assert pool.submit_nowait("a") is True
+        assert pool.submit_nowait("b") is False
+        assert pool.dropped == 1
+
+    @pytest.mark.asyncio
+    async def test_endpoint_returns_503_when_queue_full(self, sample_telemetry_batch):
+        """A full queue should surface as 503 so clients back off."""
+        from fastapi import BackgroundTasks, HTTPException
+        from app.api.events import receive_events
+        from app.models.events import EventBatch
+
+        pool = MagicMock(is_running=True, dropped=1)
+        pool.submit_nowait.return_value = False
+
+        with patch("app.api.events.telemetry_pool", pool):
+            with pytest.raises(HTTPException) as exc:
+                await receive_events(
+                    EventBatch(**sample_telemetry_batch), BackgroundTasks()
+                )
+
+        assert exc.value.status_code == 503
+        assert exc.value.headers["Retry-After"] == "1"
+
 
 class TestConcurrencyLock:
     """Tests for Redis-based concurrency lock."""
@@ -366,6 +556,76 @@ class TestConcurrencyLock:
 
         assert result is True
 
+    @pytest.mark.asyncio
+    async def test_release_requires_matching_token(self, mock_redis):
+        """A stale holder must not release a lock re-acquired by another task."""
+        await mock_redis.set("test_lock", "token-b", ex=30, nx=True)
+
+        assert await mock_redis.release_lock("test_lock", "token-a") is False
+        assert "test_lock" in mock_redis._data
+
+        assert await mock_redis.release_lock("test_lock", "token-b") is True
+        assert "test_lock" not in mock_redis._data
+
+
+class TestSessionEventsReader:
+    """Tests for reading per-event documents back out of telemetry buckets."""
+
+    @pytest.mark.asyncio
+    async def test_unwinds_bucket_columns(self):
+        """The reader should match the session and unwind one doc per event."""
+        from app.db.mongo_client import MongoClient
+        from app.models.events import TelemetryEvent
+
+        events = [{"ts": 1, "type": "click", "target_id": "btn"}]
+        cursor = MagicMock()
+        cursor.to_list = AsyncMock(return_value=events)
+        buckets = MagicMock()
+        buckets.aggregate.return_value = cursor
+
+        client = MongoClient()
+        client._collections["telemetry_buckets"] = buckets
+
+        result = await client.session_events("sess-1", limit=10)
+
+        assert result == events
+        pipeline = buckets.aggregate.call_args[0][0]
+        assert pipeline[0] == {"$match": {"session_id": "sess-1"}}
+        assert {"$unwind": "$event"} in pipeline
+        assert pipeline[-1] == {"$limit": 10}
+        zipped = pipeline[2]["$project"]["event"]["$map"]["in"]
+        assert set(zipped) == set(TelemetryEvent.model_fields)
+
+
+class TestBufferedWriter:
+    """Tests for the batched Mongo writer's shutdown path."""
+
+    @pytest.mark.asyncio
+    async def test_stop_flushes_pending_batch(self):
+        """Docs pushed right before stop() must all reach insert_many."""
+        from app.db.mongo_client import BufferedWriter
+
+        written = []
+
+        async def insert_many(docs, ordered=False):
+            await asyncio.sleep(0.01)  # Keep a flush in flight during stop()
+            written.extend(docs)
+
+        db = MagicMock()
+        db.get_collection.return_value.insert_many = insert_many
+        writer = BufferedWriter("motor_telemetry", max_batch=4, flush_interval=1.0)
+        writer.start(db)
+
+        for i in range(10):
+            assert writer.push({"i": i}) is True
+        await asyncio.sleep(0)  # Let the first batch be pulled off the queue
+        await writer.stop()
+
+        assert sorted(d["i"] for d in written) == list(range(10))
+        assert writer.failed_docs == 0
+        assert writer.dropped_docs == 0
+        assert writer.push({"i": 10}) is False
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
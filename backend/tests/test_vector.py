@@ -74,3 +74,44 @@ class TestVectorStore:
 
         assert len(results) == 1
         assert results[0].score > 0.99 
+
+    def test_search_orders_and_filters(self):
+        """Results should be sorted by score and respect filter_fn"""
+        store = VectorStore()
+        store.add(1, [1.0, 0.0] + [0.0] * (FEATURE_DIMENSIONS - 2), {"genre": "a"})
+        store.add(2, [1.0, 1.0] + [0.0] * (FEATURE_DIMENSIONS - 2), {"genre": "b"})
+        store.add(3, [0.0, 1.0] + [0.0] * (FEATURE_DIMENSIONS - 2), {"genre": "a"})
+
+        query = [1.0, 0.2] + [0.0] * (FEATURE_DIMENSIONS - 2)
+        results = store.search(query, top_k=3)
+        assert [r.id for r in results] == [1, 2, 3]
+
+        filtered = store.search(
+            query, top_k=3, filter_fn=lambda id, meta: meta["genre"] == "a"
+        )
+        assert [r.id for r in filtered] == [1, 3]
+
+    def test_vectors_share_matrix_after_search(self):
+        """After a search, stored vectors should be views of one matrix."""
+        store = VectorStore()
+        store.add(1, [1.0] * FEATURE_DIMENSIONS)
+        store.add(2, [0.5] * FEATURE_DIMENSIONS)
+
+        results = store.search([1.0] * FEATURE_DIMENSIONS, top_k=2)
+
+        assert all(v.base is not None for v in store.vectors.values())
+        assert results[0].vector.shape == (FEATURE_DIMENSIONS,)
+
+    def test_add_many_matches_add(self):
+        """A batch add should normalize and rank like individual adds."""
+        rows = [[1.0, 0.0], [1.0, 1.0], [0.0, 0.0]]
+        vectors = [r + [0.0] * (FEATURE_DIMENSIONS - 2) for r in rows]
+        single, batch = VectorStore(), VectorStore()
+        for i, vec in enumerate(vectors):
+            single.add(i, vec)
+        batch.add_many([0, 1, 2], vectors)
+
+        query = [1.0, 0.2] + [0.0] * (FEATURE_DIMENSIONS - 2)
+        expected = [(r.id, r.score) for r in single.search(query, top_k=3)]
+        assert [(r.id, r.score) for r in batch.search(query, top_k=3)] == expected
+        assert batch.get(0).dtype.name == "float32"
@@ -86,7 +86,7 @@ async def long_context_node(state: AgentState) -> dict:
     from app.db.mongo_client import mongo_client
     history = []
     try:
-        cursor = mongo_client.db.reducer_snapshots.find(
+        cursor = mongo_client.reducer_snapshots.find(
             {"session_id": state["session_id"]}
         ).sort("timestamp", -1).limit(5)
         history = await cursor.to_list(length=5)
@@ -4,7 +4,7 @@ Keys by page type + device type for quick frontend rehydration
 """
 
 import hashlib
-import json
+import orjson
 from typing import Optional
 
 
@@ -35,7 +35,7 @@ class LayoutCache:
 
         key = self._make_key(session_id, page_type, device_type)
         value = await self.client.get(key)
-        return json.loads(value) if value else None
+        return orjson.loads(value) if value else None
 
     async def set(
         self,
@@ -53,7 +53,7 @@ class LayoutCache:
         await self.client.setex(
             key,
             ttl or self.default_ttl,
-            json.dumps(layout),
+            orjson.dumps(layout),
         )
 
     async def invalidate(
@@ -77,7 +77,8 @@ class LayoutCache:
 
     def compute_hash(self, layout: dict) -> str:
         """Compute hash of layout for change detection"""
-        return hashlib.md5(json.dumps(layout, sort_keys=True).encode()).hexdigest()
+        payload = orjson.dumps(layout, option=orjson.OPT_SORT_KEYS)
+        return hashlib.md5(payload).hexdigest()
 
 
 layout_cache = LayoutCache()
@@ -3,7 +3,7 @@ Redis cache implementation
 Primary real-time cache for session data
 """
 
-import json
+import orjson
 from typing import Any, Optional
 
 
@@ -21,13 +21,13 @@ class RedisCache:
         if not self.client:
             return None
         value = await self.client.get(key)
-        return json.loads(value) if value else None
+        return orjson.loads(value) if value else None
 
     async def set(self, key: str, value: Any, ttl: int = 300):
         """Set value with TTL in seconds"""
         if not self.client:
             return
-        await self.client.setex(key, ttl, json.dumps(value))
+        await self.client.setex(key, ttl, orjson.dumps(value))
 
     async def delete(self, key: str):
         """Delete key"""
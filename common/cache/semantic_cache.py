@@ -5,10 +5,10 @@ Stores cache in Redis for persistence across restarts.
 """
 
 import hashlib
-import json
 import logging
 from typing import Optional, Tuple, Dict, Any
 import numpy as np
+import orjson
 
 logger = logging.getLogger(__name__)
 
@@ -22,6 +22,9 @@ class SemanticCache:
     Cache entries are stored in Redis with format:
     - Key: semantic_cache:{hash}
     - Value: JSON {embedding: [...], result: {...}, created_at: timestamp}
+
+    Embeddings are stored unit-normalized, so similarity is a plain dot
+    product against the (also normalized) query.
     """
 
     def __init__(
@@ -126,7 +129,8 @@ class SemanticCache:
 
             cache_key = self._make_key(summary)
             cache_entry = {
-                "embedding": embedding.tolist(),
+                "embedding": embedding,
+                "normalized": True,
                 "result": result,
                 "summary_hash": self._hash(summary),
             }
@@ -134,8 +138,11 @@ class SemanticCache:
             # Store in Redis if available
             if self.redis:
                 try:
+                    # orjson writes the float32 array directly (no tolist)
                     await self.redis.set(
-                        cache_key, json.dumps(cache_entry), ttl=self.ttl
+                        cache_key,
+                        orjson.dumps(cache_entry, option=orjson.OPT_SERIALIZE_NUMPY),
+                        ttl=self.ttl,
                     )
                     # Track the key so we can find it later
                     await self._add_cache_key(cache_key)
@@ -166,7 +173,7 @@ class SemanticCache:
             embedding = await loop.run_in_executor(
                 None, lambda: self.embeddings_model.embed_query(text)
             )
-            return np.array(embedding)
+            return self._normalize(np.asarray(embedding, dtype=np.float32))
         except Exception as e:
             logger.error(f"Embedding generation failed: {e}")
             return None
@@ -174,9 +181,10 @@ class SemanticCache:
     async def _find_similar(
         self, embedding: np.ndarray
     ) -> Tuple[Optional[Dict], float]:
-        """Find most similar cached entry."""
-        best_result = None
-        best_similarity = 0.0
+        """Find most similar cached entry (embedding must be unit-normalized)."""
+        dim = len(embedding)
+        embeddings = []
+        results = []
 
         # Check Redis cache first
         if self.redis:
@@ -185,19 +193,19 @@ class SemanticCache:
                 # Note: In production, use Redis SCAN with pattern
                 keys = await self._get_cache_keys()
 
-                for key in keys:
+                # One MGET for every tracked entry instead of a GET per key
+                for data in await self.redis.mget(keys):
                     try:
-                        data = await self.redis.get(key)
                         if data:
-                            entry = json.loads(data)
-                            cached_embedding = np.array(entry["embedding"])
-                            similarity = self._cosine_similarity(
-                                embedding, cached_embedding
-                            )
-
-                            if similarity > best_similarity:
-                                best_similarity = similarity
-                                best_result = entry["result"]
+                            entry = orjson.loads(data)
+                            # Entries written before normalization was
+                            # introduced are skipped until they expire
+                            if (
+                                entry.get("normalized")
+                                and len(entry["embedding"]) == dim
+                            ):
+                                embeddings.append(entry["embedding"])
+                                results.append(entry["result"])
                     except Exception:
                         continue
 
@@ -205,13 +213,20 @@ class SemanticCache:
                 logger.warning(f"Redis cache scan failed: {e}")
 
         # Also check memory cache
-        for key, (cached_embedding, result) in self._memory_cache.items():
-            similarity = self._cosine_similarity(embedding, cached_embedding)
-            if similarity > best_similarity:
-                best_similarity = similarity
-                best_result = result
+        for cached_embedding, result in self._memory_cache.values():
+            if len(cached_embedding) == dim:
+                embeddings.append(cached_embedding)
+                results.append(result)
+
+        if not embeddings:
+            return None, 0.0
 
-        return best_result, best_similarity
+        # All rows and the query are unit vectors: cosine is one matmul
+        similarities = np.asarray(embeddings, dtype=np.float32) @ embedding
+        best = int(similarities.argmax())
+        if similarities[best] <= 0.0:
+            return None, 0.0
+        return results[best], float(similarities[best])
 
     async def _get_cache_keys(self) -> list:
         """Get all semantic cache keys from Redis."""
@@ -223,7 +238,7 @@ class SemanticCache:
             # For now, we'll manage a key set
             keys_set_data = await self.redis.get("semantic_cache:keys")
             if keys_set_data:
-                return json.loads(keys_set_data)
+                return orjson.loads(keys_set_data)
             return []
         except Exception:
             return []
@@ -243,7 +258,7 @@ class SemanticCache:
                     oldest_key = keys.pop(0)
                     await self.redis.delete(oldest_key)
                 await self.redis.set(
-                    "semantic_cache:keys", json.dumps(keys), ttl=self.ttl
+                    "semantic_cache:keys", orjson.dumps(keys), ttl=self.ttl
                 )
         except Exception:
             pass
@@ -256,6 +271,12 @@ class SemanticCache:
             return 0.0
         return float(np.dot(a, b) / (norm_a * norm_b))
 
+    @staticmethod
+    def _normalize(vector: np.ndarray) -> np.ndarray:
+        """Scale a vector to unit length (zero vectors are returned as-is)."""
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+
     def _make_key(self, summary: str) -> str:
         """Generate Redis key for cache entry."""
         return f"semantic_cache:{self._hash(summary)}"
@@ -298,8 +319,12 @@ def generate_telemetry_summary(
     if motor_data:
         avg_velocity = 0
         avg_acceleration = 0
-        for sample in motor_data[-10:]:  # Last 10 samples
-            if isinstance(sample, dict):
+        if hasattr(motor_data, "vel"):
+            # MotorFrames arrays from the backend pipeline (last 10 samples)
+            avg_velocity = float(np.abs(motor_data.vel[-10:]).sum()) / 2
+            avg_acceleration = float(np.abs(motor_data.acc[-10:]).sum()) / 2
+        else:
+            for sample in motor_data[-10:]:  # Last 10 samples
                 vel = sample.get("velocity", {})
                 acc = sample.get("acceleration", {})
                 avg_velocity += (abs(vel.get("x", 0)) + abs(vel.get("y", 0))) / 2
@@ -2,9 +2,19 @@
 Shopify API client
 """
 
-import httpx
+import importlib.util
 from typing import List, Optional
 
+import httpx
+
+# HTTP/2 needs the optional `h2` package (httpx[http2]); fall back to HTTP/1.1
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# One pooled client per ShopifyClient: connections (and their TLS sessions)
+# are kept alive and reused across product calls
+_TIMEOUT = httpx.Timeout(5.0, connect=1.0)
+_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=50)
+
 
 class ShopifyClient:
     """
@@ -23,7 +33,13 @@ class ShopifyClient:
         self.api_secret = api_secret
         self.store_url = store_url
         self.api_version = api_version
-        self.client = httpx.AsyncClient()
+        self.client = httpx.AsyncClient(
+            base_url=self.base_url,
+            headers=self.headers,
+            http2=HTTP2_AVAILABLE,
+            timeout=_TIMEOUT,
+            limits=_LIMITS,
+        )
 
     @property
     def base_url(self) -> str:
@@ -42,19 +58,17 @@ class ShopifyClient:
         collection_id: Optional[str] = None,
     ) -> List[dict]:
         """Fetch products from Shopify"""
-        url = f"{self.base_url}/products.json"
         params = {"limit": limit}
         if collection_id:
             params["collection_id"] = collection_id
 
-        response = await self.client.get(url, headers=self.headers, params=params)
+        response = await self.client.get("/products.json", params=params)
         response.raise_for_status()
         return response.json().get("products", [])
 
     async def get_product(self, product_id: str) -> Optional[dict]:
         """Fetch single product"""
-        url = f"{self.base_url}/products/{product_id}.json"
-        response = await self.client.get(url, headers=self.headers)
+        response = await self.client.get(f"/products/{product_id}.json")
         if response.status_code == 404:
             return None
         response.raise_for_status()
@@ -62,13 +76,12 @@ class ShopifyClient:
 
     async def get_collections(self) -> List[dict]:
         """Fetch product collections"""
-        url = f"{self.base_url}/custom_collections.json"
-        response = await self.client.get(url, headers=self.headers)
+        response = await self.client.get("/custom_collections.json")
         response.raise_for_status()
         return response.json().get("custom_collections", [])
 
     async def close(self):
-        """Close HTTP client"""
+        """Close HTTP client (on app shutdown only; the pool is shared)"""
         await self.client.aclose()
 
 
@@ -13,7 +13,7 @@ export interface MotorSample {
 export interface MotorTelemetryPayload {
   session_id: string;
   device: 'mouse' | 'touch';
-  t0: number;        // Unix timestamp of first sample
+  t0: number;        // Unix timestamp of first sample (integer ms)
   dt: number;        // Milliseconds between samples
   samples: [number, number][]; // [[x, y], ...]
 }
@@ -40,7 +40,7 @@ export type EventType =
 
 /** Single telemetry event */
 export interface TelemetryEvent {
-  ts: number;           // Unix timestamp
+  ts: number;           // Unix timestamp (integer seconds)
   type: EventType;
   target_id: string;    // Module ID or element identifier
   duration_ms?: number; // For hover events
@@ -61,7 +61,7 @@ export type DeviceType = 'desktop' | 'mobile' | 'tablet';
 export interface TelemetryBatch {
   session_id: string;
   device_type: DeviceType;
-  timestamp: number;
+  timestamp: number;    // Unix timestamp (integer seconds)
   motor?: MotorTelemetryPayload;
   events: TelemetryEvent[];
 }